@@ -11,6 +11,14 @@ setup(
         "cryptography>=41.0",
         # add any other runtime dependencies here
     ],
+    extras_require={
+        # optional accelerators; every code path has a pure NumPy/stdlib fallback
+        "fast": [
+            "numba>=0.58",
+            "orjson>=3.9",
+            "ciso8601>=2.3",
+        ],
+    },
     python_requires=">=3.8",
     description="Shared Option Features and Utilities",
     author="Davis Kim",
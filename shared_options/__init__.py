@@ -7,3 +7,31 @@ Includes:
 - Typed data classes for option features
 - Helper functions for feature extraction and processing
 """
+
+# Public names are resolved lazily (PEP 562) so `import shared_options` stays cheap:
+# pydantic, numpy and the services stack load only when one of these is first used.
+_LAZY_EXPORTS = {
+    "OptionFeature": "shared_options.models.OptionFeature",
+    "OptionFeatureBatch": "shared_options.models.OptionFeatureBatch",
+    "FEATURE_COLS": "shared_options.constants.constants",
+    "features_to_array": "shared_options.services.utils",
+    "features_to_array_batch": "shared_options.services.utils",
+    "extract_features_from_snapshot": "shared_options.services.utils",
+    "extract_features_batch": "shared_options.services.utils",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
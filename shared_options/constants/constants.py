@@ -1,5 +1,12 @@
+from operator import attrgetter
+
 # Columns for ML pipeline
 FEATURE_COLS = [
     "optionType","strikePrice","lastPrice","bid","ask","bidSize","askSize","volume","openInterest",
     "nearPrice","inTheMoney","delta","gamma","theta","vega","rho","iv","spread","midPrice","moneyness","daysToExpiration"
 ]
+
+# C-implemented per-column accessors in FEATURE_COLS order
+FEATURE_GETTERS = tuple(attrgetter(c) for c in FEATURE_COLS)
+# One C-level call returning the whole row as a tuple
+FEATURE_ROW_GETTER = attrgetter(*FEATURE_COLS)
@@ -1,6 +1,156 @@
-from cryptography.fernet import Fernet
-from shared_options.services.utils import get_boolean_input
+from functools import lru_cache
+from typing import List
+import base64
 import os
+import platform
+import struct
+import subprocess
+import sys
+
+# Set SHARED_OPTIONS_USE_FERNET=1 to keep writing legacy Fernet tokens.
+USE_FERNET = os.getenv("SHARED_OPTIONS_USE_FERNET", "0") == "1"
+
+# AES-GCM blobs are stored as MAGIC || nonce || ciphertext+tag. The magic prefix
+# lets decryptItem() tell them apart from Fernet tokens, which always start with "gAAAAA".
+# AGCM1 blobs used the raw Fernet key bytes as the GCM key and are no longer read.
+_AEAD_MAGIC = b"AGCM2"
+_AEAD_MAGIC_V1 = b"AGCM1"
+# HKDF context for the GCM key: the Fernet key (its HMAC + AES-CBC keys) is never used by GCM directly
+_AEAD_HKDF_INFO = b"shared_options aesgcm v1"
+_NONCE_SIZE = 12
+_RECORD_LEN = struct.Struct(">I")
+
+# Cipher objects are cached per key so repeated calls skip key decoding, the HKDF derivation and
+# the key schedule; a handful of entries covers every key a process uses.
+# cryptography is imported on first use: importers that never decrypt
+# (or only hit the lru_cached load_etrade_keysecret) don't pay for it.
+@lru_cache(maxsize=4)
+def _get_aead(key: bytes) -> "AESGCM":
+    """Return a cached AESGCM keyed by HKDF-SHA256 of the (Fernet-format, base64) secret key."""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=_AEAD_HKDF_INFO)
+    return AESGCM(hkdf.derive(base64.urlsafe_b64decode(key.strip())))
+
+
+@lru_cache(maxsize=4)
+def _get_fernet(key: bytes) -> "Fernet":
+    """Return a cached Fernet for legacy tokens."""
+    from cryptography.fernet import Fernet
+    return Fernet(key)
+
+
+def _aead_encrypt(key: bytes, plaintext: bytes) -> bytes:
+    nonce = os.urandom(_NONCE_SIZE)
+    return _AEAD_MAGIC + nonce + _get_aead(key).encrypt(nonce, plaintext, None)
+
+
+def _aead_decrypt(key: bytes, blob: bytes) -> bytes:
+    start = len(_AEAD_MAGIC)
+    nonce = blob[start:start + _NONCE_SIZE]
+    return _get_aead(key).decrypt(nonce, blob[start + _NONCE_SIZE:], None)
+
+
+def _fernet_encrypt(key: bytes, plaintext: bytes) -> bytes:
+    return _get_fernet(key).encrypt(plaintext)
+
+
+def _has_hw_aes() -> bool:
+    """Best-effort check for AES CPU instructions (AES-NI / ARMv8 crypto extensions)."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    if line.startswith(("flags", "Features")):
+                        return "aes" in line.split()
+            return False
+        if sys.platform == "darwin":
+            if platform.machine() == "arm64":
+                return True  # Apple silicon always has the crypto extensions
+            out = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.features"],
+                capture_output=True, text=True, timeout=2
+            ).stdout
+            return "AES" in out.split()
+    except Exception:
+        pass
+    # Unknown platform: assume hardware AES, which every modern desktop/server CPU has
+    return True
+
+
+HAS_HW_AES = _has_hw_aes()
+
+# Chosen once at import. Without hardware AES, GCM's GHASH runs in software and
+# Fernet (AES-CBC + HMAC) is the cheaper choice; decryptItem() reads both formats.
+_ENCRYPT = _aead_encrypt if HAS_HW_AES and not USE_FERNET else _fernet_encrypt
+
+
+def encryptItem(key: bytes, plaintext: bytes) -> bytes:
+    """Encrypt with AES-GCM, or Fernet when USE_FERNET is set / no hardware AES is available."""
+    return _ENCRYPT(key, plaintext)
+
+
+def decryptItem(key: bytes, token: bytes) -> bytes:
+    """Decrypt either an AES-GCM blob or a legacy Fernet token."""
+    if token.startswith(_AEAD_MAGIC):
+        return _aead_decrypt(key, token)
+    if token.startswith(_AEAD_MAGIC_V1):
+        raise ValueError("AGCM1 blob was encrypted with the raw Fernet key and is no longer supported; re-encrypt it")
+    return _get_fernet(key).decrypt(token)
+
+
+def bulk_encrypt(key: bytes, records: List[bytes]) -> bytes:
+    """
+    Encrypt many records with a single cipher call.
+    Each record is prefixed with a 4-byte big-endian length so bulk_decrypt() can split them again.
+    """
+    buf = bytearray()
+    for record in records:
+        buf += _RECORD_LEN.pack(len(record))
+        buf += record
+    return _ENCRYPT(key, bytes(buf))
+
+
+def bulk_decrypt(key: bytes, token: bytes) -> List[bytes]:
+    """Inverse of bulk_encrypt(): decrypt once and split back into records."""
+    data = memoryview(decryptItem(key, token))
+    records = []
+    pos = 0
+    while pos < len(data):
+        (size,) = _RECORD_LEN.unpack_from(data, pos)
+        pos += _RECORD_LEN.size
+        records.append(bytes(data[pos:pos + size]))
+        pos += size
+    return records
+
+
+def read_small(path: str) -> bytes:
+    """Read a small file (key / .enc blob) with raw os.read calls, skipping the buffered IO stack."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=2)
+def load_etrade_keysecret(sandbox: bool):
+    """
+    Decrypted (consumer_key, consumer_secret) for the sandbox or prod app.
+    Cached per flag, so every consumer built in this process shares one read + decrypt.
+    """
+    key = read_small("encryption/secret.key")
+    sandbox_suffix = "sandbox" if sandbox else "prod"
+    encrypted_key = read_small(f"encryption/etrade_consumer_key_{sandbox_suffix}.enc")
+    encrypted_secret = read_small(f"encryption/etrade_consumer_secret_{sandbox_suffix}.enc")
+    return decryptItem(key, encrypted_key).decode(), decryptItem(key, encrypted_secret).decode()
+
 
 def createEncryptionKey():
     KEY_PATH = "encryption/secret.key"
@@ -8,6 +158,7 @@ def createEncryptionKey():
     if os.path.exists(KEY_PATH):
         print(f"{KEY_PATH} already exists. Delete it manually if you want to regenerate the key.")
         exit(1)
+    from cryptography.fernet import Fernet
     key = Fernet.generate_key()
     with open("encryption/secret.key", "wb") as f:
         f.write(key)
@@ -23,14 +174,11 @@ def encryptPassword():
         print(f"{ENC_PATH} already exists. Delete it manually if you want to re-encrypt a new password.")
         exit(1)
     # Load your encryption key
-    with open("encryption/secret.key", "rb") as f:
-        key = f.read()
-
-    fernet = Fernet(key)
+    key = read_small("encryption/secret.key")
 
     # Encrypt your email password
     raw_password = input("Enter the password you want to encrypt: ").strip()
-    encrypted = fernet.encrypt(raw_password.encode())
+    encrypted = _ENCRYPT(key, raw_password.encode())
 
     with open("encryption/email_password.enc", "wb") as f:
         f.write(encrypted)
@@ -38,6 +186,8 @@ def encryptPassword():
     print("Encrypted password saved to email_password.enc")
     
 def encryptEtradeKeySecret(sandbox):
+    # Imported here so decrypt-only callers don't pull in the services stack
+    from shared_options.services.utils import get_boolean_input
 
     sandbox = get_boolean_input("Run in Sandbox mode?")
     sandbox_suffix = "sandbox" if sandbox else "prod" 
@@ -58,21 +208,18 @@ def encryptEtradeKeySecret(sandbox):
            
         
     # Load your encryption key
-    with open("encryption/secret.key", "rb") as f:
-        key = f.read()
-
-    fernet = Fernet(key)
+    key = read_small("encryption/secret.key")
 
 
     # Encrypt your email password
     raw_etrade_key = input("Enter the Etrade Key you want to encrypt: ").strip()
-    encrypted_key = fernet.encrypt(raw_etrade_key.encode())
+    encrypted_key = _ENCRYPT(key, raw_etrade_key.encode())
 
     with open(etrade_key, "wb") as f:
         f.write(encrypted_key)
         
     raw_etrade_secret = input("Enter the Etrade Secret you want to encrypt: ").strip()
-    encrypted_secret = fernet.encrypt(raw_etrade_secret.encode())
+    encrypted_secret = _ENCRYPT(key, raw_etrade_secret.encode())
 
     with open(etrade_secret, "wb") as f:
         f.write(encrypted_secret)
@@ -81,4 +228,4 @@ def encryptEtradeKeySecret(sandbox):
 
 if __name__ == "__main__":
     encryptEtradeKeySecret(None)
-    #encryptPassword()
\ No newline at end of file
+    #encryptPassword()
@@ -1,51 +1,214 @@
 # services/logging/logger.py
+import atexit
 import logging
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 import sys
 
+
+class _SkipLoggerFilter(logging.Filter):
+    """Drop records coming from one specific logger (used to route file-only / console-only messages)."""
+
+    def __init__(self, skip_name):
+        super().__init__()
+        self._skip_name = skip_name
+
+    def filter(self, record):
+        return record.name != self._skip_name
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the strftime() result for every record logged within the same second."""
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cache = (None, "")  # (whole second, formatted time); swapped as one tuple
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        cached_sec, text = self._cache
+        if sec != cached_sec:
+            text = time.strftime(datefmt or self.default_time_format, self.converter(sec))
+            self._cache = (sec, text)
+        if datefmt:
+            return text
+        return self.default_msec_format % (text, record.msecs)
+
+
+class BufferedDailyFileHandler(logging.FileHandler):
+    """
+    FileHandler that collects formatted records in memory and writes them in batches.
+    The buffer is written once it holds flush_bytes characters or flush_interval seconds
+    have passed; a timer makes sure a quiet logger still writes its tail within flush_interval.
+    Writes go to {log_dir}/{prefix}_YYYY-MM-DD.log and move to a new file at local midnight.
+    """
+
+    def __init__(self, log_dir, prefix="log", mode="a", encoding="utf-8", flush_bytes=64 * 1024, flush_interval=1.0):
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self._rollover_at = self._next_midnight(time.time())
+        super().__init__(self._path_for(time.time()), mode=mode, encoding=encoding)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buf = []
+        self._buf_size = 0
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def _path_for(self, ts):
+        return os.path.join(self.log_dir, f"{self.prefix}_{time.strftime('%Y-%m-%d', time.localtime(ts))}.log")
+
+    @staticmethod
+    def _next_midnight(ts):
+        # mktime normalizes day overflow and applies the right DST offset for that date
+        t = time.localtime(ts)
+        return time.mktime((t.tm_year, t.tm_mon, t.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+    def _rollover(self, ts):
+        # Earlier records belong to the old day's file
+        self.flush()
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None  # reopened lazily by flush()
+        self.baseFilename = os.path.abspath(self._path_for(ts))
+        self._rollover_at = self._next_midnight(ts)
+
+    def emit(self, record):
+        # Called by Handler.handle() with self.lock held
+        if record.created >= self._rollover_at:  # one float compare per record
+            self._rollover(record.created)
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        self._buf.append(msg)
+        self._buf_size += len(msg)
+        if self._buf_size >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._buf:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(self._buf))
+                self._buf = []
+                self._buf_size = 0
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+# (console, file) -> attribute name of the logger that routes to exactly those outputs
+_ROUTES = {
+    (True, True): "logger",
+    (False, True): "file_logger",
+    (True, False): "console_logger",
+}
+
+
+# The Logger whose listener currently owns the "DailyLogger" handlers (one listener per process)
+_active_logger = None
+
+
+def _close_active_logger():
+    if _active_logger is not None:
+        _active_logger.close()
+
+
+atexit.register(_close_active_logger)
+
+
 class Logger:
     def __init__(self, log_dir="logs", prefix="log"):
+        global _active_logger
         os.makedirs(log_dir, exist_ok=True)
-        today = datetime.now().astimezone().strftime("%Y-%m-%d")
-        log_file = os.path.join(log_dir, f"{prefix}_{today}.log")
 
+        # "DailyLogger" writes to both outputs; the children write to only one of them
         self.logger = logging.getLogger("DailyLogger")
-        self.logger.setLevel(logging.INFO)
+        self.file_logger = logging.getLogger("DailyLogger.file")
+        self.console_logger = logging.getLogger("DailyLogger.console")
+        self._loggers = (self.logger, self.file_logger, self.console_logger)
+        for lg in self._loggers:
+            lg.setLevel(logging.INFO)
+        # Children must not bubble up into "DailyLogger" and get written twice
+        self.file_logger.propagate = False
+        self.console_logger.propagate = False
 
-        # Remove old handlers
-        for h in self.logger.handlers[:]:
-            self.logger.removeHandler(h)
-
-        # File handler
-        fh = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        fh.setFormatter(logging.Formatter("%(asctime)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
-        self.logger.addHandler(fh)
+        # File handler (one file per local day, rolled over at midnight)
+        fh = BufferedDailyFileHandler(log_dir, prefix, mode="a", encoding="utf-8")
+        fh.setFormatter(_CachedTimeFormatter("%(asctime)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
+        fh.addFilter(_SkipLoggerFilter(self.console_logger.name))
 
         # Console handler
         ch = logging.StreamHandler()
-        ch.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
-        self.logger.addHandler(ch)
+        ch.setFormatter(_CachedTimeFormatter("%(asctime)s: %(message)s"))
+        ch.addFilter(_SkipLoggerFilter(self.file_logger.name))
 
         # Keep references
         self._file_handler = fh
         self._console_handler = ch
+        self._routes = {key: getattr(self, attr) for key, attr in _ROUTES.items()}
+        self._interactive = is_interactive()
+
+        # A newer Logger takes over the shared loggers: drain and stop the old listener first
+        previous, _active_logger = _active_logger, self
+        if previous is not None:
+            previous.close()
+            previous._file_handler.close()
+
+        # Callers only enqueue; a single listener thread owns the real handlers
+        self._queue = queue.Queue(-1)
+        self._listener = QueueListener(self._queue, fh, ch, respect_handler_level=True)
+        self._attach(QueueHandler(self._queue))
+        self._listener.start()
+
+    def _attach(self, *handlers):
+        # Remove old handlers
+        for lg in self._loggers:
+            for h in lg.handlers[:]:
+                lg.removeHandler(h)
+            for h in handlers:
+                lg.addHandler(h)
 
     def logMessage(self, message, console=False, file=True):
-        # Temporarily enable/disable handlers
-        if is_interactive():
-            console = True
-        self._file_handler.setLevel(logging.INFO if file else logging.CRITICAL+1)
-        self._console_handler.setLevel(logging.INFO if console else logging.CRITICAL+1)
-        self.logger.info(message)
-        self.flush()
-        
+        route = self._routes.get((console or self._interactive, file))
+        if route is not None:
+            route.info(message)
+
     def flush(self):
-        for handler in self.logger.handlers:
+        for handler in (self._file_handler, self._console_handler):
             handler.flush()
 
+    def close(self):
+        """Drain queued records and stop the listener; later messages are written synchronously."""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.stop()
+        self._attach(self._file_handler, self._console_handler)
+        self.flush()
+
     def _log_exit(self, reason=None):
-        self.log(f"Script terminated ({reason})")
+        self.logMessage(f"Script terminated ({reason})")
+        self.close()
 
 
 
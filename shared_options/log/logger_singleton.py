@@ -9,6 +9,7 @@ def getLogger():
     if _logger is None:
         _logger = Logger()
     if not _registered:
-        ShutdownManager.register("Singleton Logger", lambda reason=None: _logger._log_exit())
+        # last=True: FileManager and other shutdown callbacks still log through it while they close
+        ShutdownManager.register("Singleton Logger", lambda reason=None: _logger._log_exit(reason), last=True)
         _registered = True
     return _logger
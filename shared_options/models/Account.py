@@ -2,9 +2,10 @@
 from __future__ import annotations
 from shared_options.models.Position import Position
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, List
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PortfolioAccount:
     accountId: Optional[str] = None
     Position: Optional[List[Position]] = None
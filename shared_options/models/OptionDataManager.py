@@ -1,5 +1,4 @@
 import threading
-import time
 from pathlib import Path
 from shared_options.services.file_manager import FileManager
 from shared_options.log.logger_singleton import getLogger
@@ -33,14 +32,19 @@ class OptionDataManager:
 
         self.logger.logMessage(f"[OptionDataManager] Started bundler thread every {bundle_interval}s")
 
-    def add_option_record(self, record: dict):
-        """Queue an option record for writing."""
+    def add_option_record(self, record):
+        """
+        Queue an option record for writing.
+        Accepts a dict, pre-serialized JSON bytes, or a model with to_json() (serialized here, off the writer lock).
+        """
+        if hasattr(record, "to_json"):
+            record = record.to_json()
         self.file_manager.add_entry(record)
 
     def _bundle_loop(self):
         """Background thread to periodically combine and upload temp bundles."""
-        while not self._stop_bundler.is_set():
-            time.sleep(self.bundle_interval)
+        # Event.wait doubles as the interval sleep, so close() stops the bundler immediately
+        while not self._stop_bundler.wait(self.bundle_interval):
             try:
                 self.logger.logMessage("[OptionDataManager] Triggering periodic bundle rotation...")
                 self.file_manager.combine_and_rotate(bundle_limit=self.bundle_limit)
@@ -1,10 +1,22 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from typing import Optional
 from datetime import datetime, timezone
 from dataclasses import asdict as dataclass_asdict
+from shared_options.services.json_utils import dumps as json_dumps
+
+# Bound once so the timestamp default factory is a plain call with no attribute lookups
+_UTC = timezone.utc
+_NOW = datetime.now
 
 
 class OptionFeature(BaseModel):
+    # Allow dataclass-like behavior and type coercion
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        from_attributes=True,
+        validate_assignment=True,
+    )
+
     symbol: str
     osiKey: Optional[str] = None
     optionType: int                     # 1 = CALL, 0 = PUT
@@ -29,21 +41,21 @@ class OptionFeature(BaseModel):
     midPrice: Optional[float] = None
     moneyness: Optional[float] = None
     sentiment: Optional[float] = None
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(tz=timezone.utc))
+    timestamp: datetime = Field(default_factory=lambda: _NOW(_UTC))
+
+    @field_serializer("timestamp", when_used="json")
+    def _serialize_timestamp(self, ts: datetime) -> str:
+        # Keep the "+00:00" isoformat() output older readers (fromisoformat < 3.11) expect, not "Z"
+        return ts.isoformat()
 
     def to_dict(self) -> dict:
         """Return a clean dict representation (for ML model or JSON export)."""
-        d = self.dict()
-        d["timestamp"] = self.timestamp.isoformat()
-        return d
+        return self.model_dump(mode="json")
 
     def asdict(self) -> dict:
         """Dataclass-style compatibility wrapper for code using asdict()."""
         return self.to_dict()
 
-    class Config:
-        # Allow dataclass-like behavior and type coercion
-        arbitrary_types_allowed = True
-        orm_mode = True
-        allow_mutation = True
-        validate_assignment = True
+    def to_json(self) -> bytes:
+        """Serialize straight to compact JSON bytes (orjson when available); used on the record write path."""
+        return json_dumps(self.model_dump())
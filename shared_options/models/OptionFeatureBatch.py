@@ -0,0 +1,115 @@
+import numpy as np
+from typing import Iterable, Optional, Sequence
+from shared_options.constants.constants import FEATURE_COLS, FEATURE_GETTERS
+
+# Derived columns are exported as 0 when missing (same as features_to_array); other gaps become NaN
+_ZERO_IF_MISSING = frozenset(("spread", "midPrice", "moneyness"))
+
+
+class OptionFeatureBatch:
+    """
+    Struct-of-arrays container for many option feature rows.
+
+    Numeric features live in a single (N, len(FEATURE_COLS)) float32 matrix in FEATURE_COLS
+    order, with symbol/osiKey kept in parallel object arrays. Rows are appended into
+    preallocated storage that grows in chunks, so no pydantic model is built per row;
+    validation stays at the trust boundary (OptionFeature).
+    """
+
+    dtype = np.float32
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, int(capacity))
+        self._values = np.empty((capacity, len(FEATURE_COLS)), dtype=self.dtype)
+        self._symbols = np.empty(capacity, dtype=object)
+        self._osi_keys = np.empty(capacity, dtype=object)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = len(self._values)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        values = np.empty((capacity, len(FEATURE_COLS)), dtype=self.dtype)
+        values[:self._size] = self._values[:self._size]
+        symbols = np.empty(capacity, dtype=object)
+        symbols[:self._size] = self._symbols[:self._size]
+        osi_keys = np.empty(capacity, dtype=object)
+        osi_keys[:self._size] = self._osi_keys[:self._size]
+        self._values, self._symbols, self._osi_keys = values, symbols, osi_keys
+
+    def append(self, symbol: str, osiKey: Optional[str], values: Sequence[Optional[float]]):
+        """Append one row; `values` must be in FEATURE_COLS order."""
+        self._reserve(1)
+        i = self._size
+        self._values[i] = [
+            (0.0 if col in _ZERO_IF_MISSING else np.nan) if v is None else v
+            for col, v in zip(FEATURE_COLS, values)
+        ]
+        self._symbols[i] = symbol
+        self._osi_keys[i] = osiKey
+        self._size = i + 1
+
+    def append_feature(self, feature):
+        """Append an OptionFeature (or any object exposing the FEATURE_COLS attributes)."""
+        self.append(feature.symbol, feature.osiKey, [getter(feature) for getter in FEATURE_GETTERS])
+
+    @classmethod
+    def from_columns(cls, symbols: Sequence[str], osi_keys: Sequence[Optional[str]], columns: dict) -> "OptionFeatureBatch":
+        """
+        Build a batch from whole columns at once (one array assignment per feature, no per-row work).
+        `columns` maps FEATURE_COLS names to equal-length sequences; missing columns follow append()'s rules.
+        """
+        n = len(symbols)
+        batch = cls(capacity=n)
+        values = batch._values
+        for j, col in enumerate(FEATURE_COLS):
+            data = columns.get(col)
+            if data is None:
+                values[:n, j] = 0.0 if col in _ZERO_IF_MISSING else np.nan
+            else:
+                values[:n, j] = data
+        batch._symbols[:n] = symbols
+        batch._osi_keys[:n] = osi_keys
+        batch._size = n
+        return batch
+
+    @classmethod
+    def from_features(cls, features: Iterable) -> "OptionFeatureBatch":
+        features = list(features)
+        batch = cls(capacity=len(features))
+        for feature in features:
+            batch.append_feature(feature)
+        return batch
+
+    # -------------------------
+    # Views
+    # -------------------------
+    @property
+    def symbols(self) -> np.ndarray:
+        return self._symbols[:self._size]
+
+    @property
+    def osi_keys(self) -> np.ndarray:
+        return self._osi_keys[:self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one feature column."""
+        return self._values[:self._size, FEATURE_COLS.index(name)]
+
+    def to_numpy(self) -> np.ndarray:
+        """Zero-copy (N, len(FEATURE_COLS)) view of the numeric features, ready for the ML pipeline."""
+        return self._values[:self._size]
+
+    def to_pandas(self):
+        """Wrap the feature matrix in a DataFrame without copying it, plus symbol/osiKey columns."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.to_numpy(), columns=FEATURE_COLS, copy=False)
+        df.insert(0, "osiKey", self.osi_keys)
+        df.insert(0, "symbol", self.symbols)
+        return df
@@ -3,9 +3,10 @@ from __future__ import annotations
 from shared_options.models.Product import Product
 from shared_options.models.Quick import Quick
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, List
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Position:
     positionId: Optional[int] = None
     osiKey: Optional[str] = None
@@ -2,9 +2,10 @@
 from __future__ import annotations
 from shared_options.models.ProductId import ProductId
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, List
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Product:
     symbol: Optional[str] = None
     securityType: Optional[str] = None
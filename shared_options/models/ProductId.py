@@ -1,8 +1,9 @@
 #ProductId.py
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, List
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProductId:
     symbol: Optional[str] = None
     typeCode: Optional[str] = None
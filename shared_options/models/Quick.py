@@ -1,8 +1,9 @@
 #Quick.py
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, List
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Quick:
     lastTrade: Optional[float] = None
     lastTradeTime: Optional[int] = None
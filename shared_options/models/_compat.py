@@ -0,0 +1,6 @@
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters get plain dataclasses.
+# Slotted instances skip the per-object __dict__, which is most of the cost when
+# thousands of option/position records are built per chain or portfolio payload.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
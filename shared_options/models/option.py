@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+from shared_options.models._compat import DATACLASS_SLOTS
 from typing import Optional, Dict
 from datetime import datetime
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OptionGreeks:
     rho: Optional[float] = None
     vega: Optional[float] = None
@@ -12,12 +13,12 @@ class OptionGreeks:
     iv: Optional[float] = None
     currentValue: Optional[bool] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProductId:
     symbol: str
     typeCode: str
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Product:
     symbol: str
     securityType: str
@@ -28,7 +29,7 @@ class Product:
     strikePrice: Optional[float] = None
     productId: Optional[ProductId] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Quick:
     lastTrade: Optional[float] = None
     lastTradeTime: Optional[int] = None
@@ -37,7 +38,7 @@ class Quick:
     volume: Optional[int] = None
     quoteStatus: Optional[str] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OptionContract:
     symbol: str
     optionType: str
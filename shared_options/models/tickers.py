@@ -4,6 +4,10 @@ import json
 from datetime import datetime
 from services.core.cache_manager import TickerCache
 from shared_options.log.logger_singleton import getLogger
+from shared_options.services import json_utils
+
+# Security types kept from the Finnhub symbol list (frozenset: O(1) membership, built once)
+_US_TICKER_TYPES = frozenset(("Common Stock", "ADR"))
 
 
 def fetch_us_tickers_from_finnhub(ticker_cache: TickerCache):
@@ -19,18 +23,26 @@ def fetch_us_tickers_from_finnhub(ticker_cache: TickerCache):
     if r.status_code != 200:
         raise Exception(f"Finnhub failed: {r.status_code} - {r.text}")
 
-    raw_data = r.json()
+    raw_data = json_utils.loads(r.content)
 
-    # Build ticker -> company name dictionary
+    # Build ticker -> company name dictionary in a single pass.
+    # Cheaper than a pandas mask here: building a DataFrame from ~10k dicts costs more than the filter.
+    types = _US_TICKER_TYPES
     tickers_dict = {
-        s["symbol"]: s.get("description", "")
+        s["symbol"]: s.get("description") or ""
         for s in raw_data
-        if "." not in s["symbol"] and s.get("type") in ["Common Stock", "ADR"]
+        if s.get("type") in types and "." not in s["symbol"]
     }
 
     if ticker_cache is not None:
-        for symbol, name in tickers_dict.items():
-            ticker_cache.add(symbol, name)  # each ticker is its own key
+        # One dict.update when the cache supports it; older TickerCache versions only have add()
+        bulk_add = getattr(ticker_cache, "bulk_add", None)
+        if bulk_add is not None:
+            bulk_add(tickers_dict)
+        else:
+            add = ticker_cache.add
+            for symbol, name in tickers_dict.items():
+                add(symbol, name)  # each ticker is its own key
         ticker_cache._save_cache()
 
     return tickers_dict
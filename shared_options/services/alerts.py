@@ -1,11 +1,12 @@
 # alerts.py
 import os
+import re
 import smtplib
 import time
 from email.mime.text import MIMEText
-from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 from shared_options.log.logger_singleton import getLogger
+from shared_options.encryption.encryptItems import decryptItem, read_small
 
 logger = getLogger()
 
@@ -87,14 +88,13 @@ def load_encrypted_password() -> str:
     """
     Load and decrypt the email password from local encryption files.
     """
-    with open("encryption/secret.key", "rb") as key_file:
-        key = key_file.read()
+    key = read_small("encryption/secret.key")
+    encrypted = read_small("encryption/email_password.enc")
 
-    with open("encryption/email_password.enc", "rb") as enc_file:
-        encrypted = enc_file.read()
+    return decryptItem(key, encrypted).decode()
 
-    fernet = Fernet(key)
-    return fernet.decrypt(encrypted).decode()
+
+_NON_SPACE = re.compile(r"\S")
 
 
 def _split_message(message: str, max_length: int):
@@ -105,22 +105,30 @@ def _split_message(message: str, max_length: int):
     if len(message) <= max_length:
         return [message]
 
+    # Walk the message by index instead of re-slicing and re-stripping the remainder each round;
+    # the boundaries are the same as splitting at the last "\n"/" " before max_length and stripping
     chunks = []
-    while message:
-        if len(message) <= max_length:
-            chunks.append(message)
+    start, end = 0, len(message)
+    stripped_end = len(message.rstrip())
+    while start < end:
+        if end - start <= max_length:
+            chunks.append(message[start:end])
             break
 
         # Try to split at the last newline or space within the limit
+        limit = start + max_length
         split_point = max(
-            message.rfind("\n", 0, max_length),
-            message.rfind(" ", 0, max_length),
+            message.rfind("\n", start, limit),
+            message.rfind(" ", start, limit),
         )
 
         if split_point == -1:
-            split_point = max_length
+            split_point = limit
 
-        chunks.append(message[:split_point].strip())
-        message = message[split_point:].strip()
+        chunks.append(message[start:split_point].strip())
+        # The rest of the message starts at the next non-whitespace character
+        match = _NON_SPACE.search(message, split_point, stripped_end)
+        start = match.start() if match else stripped_end
+        end = stripped_end
 
     return chunks
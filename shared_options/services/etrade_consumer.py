@@ -1,15 +1,21 @@
 # etrade_consumer.py
 import os
 import json
+import asyncio
+import functools
 from typing import List
 import time as pyTime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from cryptography.fernet import Fernet
 from requests_oauthlib import OAuth1Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlencode
 from shared_options.models.Account import Account, PortfolioAccount
 from shared_options.models.Position import Position
 from shared_options.models.option import OptionContract,Product,Quick,OptionGreeks,ProductId
+from shared_options.encryption.encryptItems import load_etrade_keysecret
 from services.threading.api_worker import ApiWorker,HttpMethod
 from shared_options.log.logger_singleton import getLogger
 from shared_options.services.token_status import TokenStatus
@@ -17,8 +23,49 @@ from shared_options.services.utils import write_scratch
 import enum
 from shared_options.services.utils import is_interactive
 from shared_options.services.alerts import send_alert
+from shared_options.services import json_utils
 
 TOKEN_LIFETIME_DAYS = 90
+# load_tokens() skips the accounts/list probe if the token was validated this recently (seconds)
+SESSION_CHECK_TTL = 600
+
+# Connection pool / retry policy shared by every E*TRADE session (keep-alive, so TLS is negotiated once per socket)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 64
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,  # hand the final response back instead of raising; callers check its status
+)
+SESSION_HEADERS = {"Accept": "application/json", "Connection": "keep-alive"}
+
+# Per-expiry option chain fetches run in parallel; the semaphore caps in-flight requests per consumer
+MAX_CHAIN_WORKERS = 8
+MAX_CONCURRENT_REQUESTS = 8
+
+# OptionChainResponse "Call" keys copied onto OptionContract
+_OPTION_FIELDS = (
+    "symbol", "optionType", "strikePrice", "displaySymbol", "osiKey",
+    "bid", "ask", "bidSize", "askSize", "inTheMoney", "volume",
+    "openInterest", "netChange", "lastPrice", "quoteDetail",
+    "optionCategory", "timeStamp", "adjustedFlag", "expiryDate", "nearPrice",
+)
+
+# get_accounts() result is reused for this many seconds
+ACCOUNTS_CACHE_TTL = 3600
+
+# E*TRADE error codes: 10033 = invalid symbol, 10031/10032 = no options for the symbol/expiry
+ERR_INVALID_SYMBOL = 10033
+ERR_NO_OPTIONS = (10031, 10032)
+
+# Max symbols per /market/quote request
+QUOTE_BATCH_SIZE = 25
+
+# get_expiry_dates() cache: symbol -> (expires_at monotonic, dates list or the raised error)
+EXPIRY_CACHE_TTL = 600
+EXPIRY_NEGATIVE_TTL = 60
+EXPIRY_CACHE_MAXSIZE = 1024
 
 class ActionResponse(enum.Enum):
     SUCCESS = "SUCCESS"
@@ -51,16 +98,30 @@ class EtradeConsumer:
         self.apiWorker = apiWorker
         self.token_status = TokenStatus()
         self.logger = getLogger()
+        self._request_gate = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self._expiry_cache = {}
+        self._auth_lock = threading.Lock()
+        self._session_generation = 0
+        self._token_created_at = 0
+        self._accounts_cache = None
+        self._accounts_cache_ts = 0
         envType = "nonProd" if sandbox else "prod"
 
         self.consumer_key, self.consumer_secret = self.load_encrypted_etrade_keysecret(sandbox)
         self.token_file = os.path.join("encryption", f"etrade_tokens_{envType}.json")
         self.base_url = "https://apisb.etrade.com" if sandbox else "https://api.etrade.com"
+        # Endpoint URLs are fixed per consumer; build them once
+        self._url_accounts_list = f"{self.base_url}/v1/accounts/list.json"
+        self._url_portfolio_tpl = f"{self.base_url}/v1/accounts/{{}}/portfolio.json"
+        self._url_option_expiredate = f"{self.base_url}/v1/market/optionexpiredate.json"
+        self._url_option_chains = f"{self.base_url}/v1/market/optionchains.json"
+        self._url_quote_tpl = f"{self.base_url}/v1/market/quote/{{}}.json"
 
         if not self.consumer_key:
             raise Exception("Missing E*TRADE consumer key")
 
-        if not os.path.exists(self.token_file):
+        token_data = self._read_token_file()
+        if token_data is None:
             self.logger.logMessage("No token file found. Starting OAuth...")
             while True:
                 generate_status = self.generate_token()
@@ -71,17 +132,32 @@ class EtradeConsumer:
                 elif generate_status == ActionResponse.SUCCESS:
                     break
         else:
-            self.load_tokens()
+            self.load_tokens(_token_data=token_data)
 
 
     def get(self, url: str, headers=None, params=None):
-        # Existing headers (may be None)
-        headers = headers or {}  # ensure it's a dict
-
-        # Add/overwrite Accept header
-        headers.update({"Accept": "application/json"})
-        
+        # On 401, retry once if a refreshed token can be picked up (see _reload_after_401)
+        generation = self._session_generation
+        try:
+            r = self._get_once(url, headers, params)
+        except TokenExpiredError:
+            if not self._reload_after_401(generation):
+                self._accounts_cache = None
+                self.logger.logMessage("[Auth] Token expired or unauthorized, need to regenerate")
+                self.token_status.set_status(False)
+                raise
+            return self._get_once(url, headers, params)
+        if getattr(r, "status_code", None) == 401:
+            if self._reload_after_401(generation):
+                return self._get_once(url, headers, params)
+            self._accounts_cache = None
+        return r
+
+    def _get_once(self, url: str, headers=None, params=None):
         if self.apiWorker is not None:
+            # Add/overwrite Accept header (the session path sets it once in _build_session)
+            headers = dict(headers or {})
+            headers["Accept"] = "application/json"
             error = ""
             r = self.apiWorker.call_api(HttpMethod.GET, url, headers=headers, params=params)
             if r is not None:
@@ -99,9 +175,7 @@ class EtradeConsumer:
                         if hasattr(r,"response"):
                             status_code = r.response.status_code
                     if status_code == 401:
-                        self.logger.logMessage("[Auth] Token expired or unauthorized, need to regenerate")
-                        self.token_status.set_status(False)
-                        raise TokenExpiredError("OAuth token expired")  
+                        raise TokenExpiredError("OAuth token expired")
                     elif status_code == 408:
                         raise TimeoutError    
                     elif status_code == 400:
@@ -109,15 +183,14 @@ class EtradeConsumer:
                         if hasattr(r,"response"):
                             error = r.response.text
                         else:
-                            error = r.error
-                        if "10033" in error:
+                            error = r.error or ""
+                        code = self._etrade_error_code(error)
+                        if code == ERR_INVALID_SYMBOL:
                             raise InvalidSymbolError(error)
-                        elif "10031" in error or "10032 in error":
-                            write_scratch(f"Error: {error} | Params: {str(params)}")
-                            raise (NoOptionsError(error))
-                        else:
-                            write_scratch(f"Error: {error} | Params: {str(params)}")
-                            raise Exception(error)
+                        write_scratch(f"Error: {error} | Params: {str(params)}")
+                        if code in ERR_NO_OPTIONS:
+                            raise NoOptionsError(error)
+                        raise Exception(error)
    
                     else:
                         raise Exception(f"Response received an error. Calculated status code: {status_code}. Response: {json.dumps(r, indent=2, default=str)}")        
@@ -144,29 +217,7 @@ class EtradeConsumer:
         :param params: dict of query parameters
         :param data: dict/json payload to send in the body
         """
-                
-        headers = headers or {}
-        headers.update({
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.oauth_token}"
-        })
-        
-        if self.apiWorker is not None:
-            # apiWorker expects params; encode data as JSON string
-            payload = json.dumps(data) if data else None
-            response = self.apiWorker.call_api(HttpMethod.PUT, url, headers=headers, params=params, data=payload)
-            if response.get("ok"):
-                return response.get("data")
-            else:
-                self.logger.logMessage(f"Error {response.get('status_code')}: {response.get('error')}")
-                return None
-        else:
-            try:
-                return self.session.put(url, headers=headers, params=params, json=data)
-            except Exception as e:
-                self.logger.logMessage(f"[PUT Exception] {e} for URL: {url}")
-                return None
-
+        return self._send_json("PUT", url, headers, params, data)
 
     def post(self, url, headers=None, params=None, data=None):
         """
@@ -177,16 +228,19 @@ class EtradeConsumer:
         :param params: dict of query parameters
         :param data: dict/json payload to send in the body
         """
-        headers = headers or {}
-        headers.update({
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.oauth_token}"
-        })
+        return self._send_json("POST", url, headers, params, data)
+
+    def _send_json(self, verb, url, headers, params, data):
+        """
+        Shared body of put/post. The payload is encoded once, straight to bytes (orjson when available),
+        and handed to the transport as the request body, so it isn't re-encoded on the way to the socket.
+        """
+        # Prebuilt per token in _set_session; ours still win over caller-supplied duplicates
+        headers = {**headers, **self._json_headers} if headers else self._json_headers
+        payload = json_utils.dumps(data) if data is not None else None
 
         if self.apiWorker is not None:
-            # apiWorker expects params; encode data as JSON string
-            payload = json.dumps(data) if data else None
-            response = self.apiWorker.call_api(HttpMethod.POST, url, headers=headers, params=params, data=payload)
+            response = self.apiWorker.call_api(getattr(HttpMethod, verb), url, headers=headers, params=params, data=payload)
             if response.get("ok"):
                 return response.get("data")
             else:
@@ -194,42 +248,43 @@ class EtradeConsumer:
                 return None
         else:
             try:
-                resp = self.session.post(url, headers=headers, params=params, json=data)
-                return resp
+                return self.session.request(verb, url, headers=headers, params=params, data=payload)
             except Exception as e:
-                self.logger.logMessage(f"[POST Exception] {e} for URL: {url}")
+                self.logger.logMessage(f"[{verb} Exception] {e} for URL: {url}")
                 return None
 
 
     # ------------------- TOKENS -------------------
-    def load_tokens(self, generate_new_token=True):
-        """Load saved tokens or generate if missing/expired."""
-        token_data = {}
-        if os.path.exists(self.token_file):
-            with open(self.token_file, "r") as f:
-                token_data = json.load(f)
+    def _read_token_file(self):
+        """Parsed token file, or None when it does not exist (one open, no separate exists() check)."""
+        try:
+            with open(self.token_file, "rb") as f:
+                return json_utils.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    def load_tokens(self, generate_new_token=True, _token_data=None):
+        """
+        Load saved tokens or generate if missing/expired.
+        _token_data lets __init__ hand over the file it already parsed instead of reading it again.
+        """
+        token_data = _token_data if _token_data is not None else (self._read_token_file() or {})
 
         self.oauth_token = token_data.get("oauth_token")
         self.oauth_token_secret = token_data.get("oauth_token_secret")
-        created_at = token_data.get("created_at", 0)
+        created_at = int(token_data.get("created_at", 0))
+        self._token_created_at = created_at
 
         # Build OAuth1 session if we have tokens
         if self.oauth_token and self.oauth_token_secret:
-            self.session = OAuth1Session(
-                self.consumer_key,
-                client_secret=self.consumer_secret,
-                resource_owner_key=self.oauth_token,
-                resource_owner_secret=self.oauth_token_secret,
-            )
+            self._set_session(self.oauth_token, self.oauth_token_secret)
 
-        # Check token age
-        local_tz = datetime.now().astimezone().tzinfo
-        token_age_days = (datetime.now().astimezone() - datetime.fromtimestamp(created_at, tz=local_tz)).days
+        # Check token age (both sides are epoch seconds, so no timezone handling is needed)
+        token_age_days = (int(pyTime.time()) - created_at) // 86400
 
-        
         if (not self.oauth_token or token_age_days >= TOKEN_LIFETIME_DAYS) and generate_new_token:
             if not is_interactive():
-                if not self.token_status.is_valid:
+                if not self.token_status.is_valid():
                     send_alert("[Option-Alerts] Token found invalid, waiting for token to be refreshed")
                     self.logger.logMessage("Running as background job and token invalid, waiting for token refresh")
                     self.token_status.wait_until_valid()
@@ -237,6 +292,9 @@ class EtradeConsumer:
                 self.logger.logMessage(f"Token missing or expired (age={token_age_days}d). Generating new token...")
                 if not self.generate_token():
                     raise Exception("Failed to generate new OAuth token.")
+        elif token_age_days < TOKEN_LIFETIME_DAYS - 1 and self.token_status.validated_within(SESSION_CHECK_TTL):
+            # Token confirmed by an API call moments ago (this or another process): skip the probe round trip
+            self.logger.logMessage("Loaded token valid (validated recently)")
         else:
             # Extra check: make sure the token actually works with the API
             if not self._check_session_valid():
@@ -256,8 +314,73 @@ class EtradeConsumer:
                 self.logger.logMessage("Loaded token valid")
                 self.token_status.set_status(True)
 
+        # Refresh ahead of expiry instead of failing mid-workflow with a 401 storm
+        if self.oauth_token and self.token_status.is_valid() and self._should_refresh_soon():
+            # Age again from _token_created_at: a token refreshed above (or by another process) is fresh
+            token_age_days = (int(pyTime.time()) - self._token_created_at) // 86400
+            expired = token_age_days >= TOKEN_LIFETIME_DAYS
+            if expired:
+                message = f"Token is {token_age_days}d old and past its {TOKEN_LIFETIME_DAYS}d lifetime"
+            else:
+                message = f"Token is {token_age_days}d old and expires within a day"
+            if is_interactive() and generate_new_token:
+                self.logger.logMessage(f"{message}. Generating new token...")
+                self.generate_token()
+            elif self.token_status.claim_expiry_alert(self._token_created_at, 2 if expired else 1):
+                # send_alert texts (and sleeps per chunk): once per token and stage, not on every worker start
+                send_alert(f"[Option-Alerts] {message}, refresh it to avoid interruptions")
+            else:
+                self.logger.logMessage(f"{message} (alert already sent)")
 
 
+
+    def _set_session(self, oauth_token, oauth_token_secret):
+        """Install tokens and a fresh session; the generation bump tells in-flight 401s a new token is live."""
+        self.oauth_token = oauth_token
+        self.oauth_token_secret = oauth_token_secret
+        self.session = self._build_session(oauth_token, oauth_token_secret)
+        self._json_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {oauth_token}",
+        }
+        self._session_generation += 1
+
+    def _reload_after_401(self, generation) -> bool:
+        """
+        Called after a 401. Returns True when a different token is now installed and the request is worth retrying.
+        Serialized by a lock so concurrent workers don't stampede: the first one reloads the token file
+        (another process may have refreshed it); the rest see the bumped generation and just retry.
+        """
+        with self._auth_lock:
+            if self._session_generation != generation:
+                return True
+            token_data = self._read_token_file() or {}
+            token = token_data.get("oauth_token")
+            secret = token_data.get("oauth_token_secret")
+            if not token or not secret or (token, secret) == (self.oauth_token, self.oauth_token_secret):
+                return False
+            self._set_session(token, secret)
+            self._token_created_at = int(token_data.get("created_at", 0))
+            self.logger.logMessage("[Auth] 401 received; picked up refreshed token from token file")
+            return True
+
+    def _should_refresh_soon(self) -> bool:
+        """True once the token is within a day of TOKEN_LIFETIME_DAYS."""
+        return int(pyTime.time()) - self._token_created_at > (TOKEN_LIFETIME_DAYS - 1) * 86400
+
+    def _build_session(self, oauth_token, oauth_token_secret) -> OAuth1Session:
+        """OAuth1 session with a pooled keep-alive adapter and retry/backoff on transient errors."""
+        session = OAuth1Session(
+            self.consumer_key,
+            client_secret=self.consumer_secret,
+            resource_owner_key=oauth_token,
+            resource_owner_secret=oauth_token_secret,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=HTTP_RETRY)
+        session.mount("https://", adapter)
+        session.headers.update(SESSION_HEADERS)
+        return session
+
     def _validate_tokens(self):
         """
         Validate current tokens; attempt refresh first.
@@ -276,7 +399,7 @@ class EtradeConsumer:
     def _check_session_valid(self):
         """Simple API test to check if the current session is valid."""
         try:
-            url = f"{self.base_url}/v1/accounts/list.json"
+            url = self._url_accounts_list
             r = self.get(url)
             return r and getattr(r, "status_code", 200) == 200
         except Exception as e:
@@ -341,12 +464,7 @@ class EtradeConsumer:
                     # Store tokens
                     self.oauth_token = access_token_response.get("oauth_token")
                     self.oauth_token_secret = access_token_response.get("oauth_token_secret")                    # Persist to disk
-                    self.session = OAuth1Session(
-                        self.consumer_key,
-                        client_secret=self.consumer_secret,
-                        resource_owner_key=self.oauth_token,
-                        resource_owner_secret=self.oauth_token_secret,
-                    )                    
+                    self._set_session(self.oauth_token, self.oauth_token_secret)
                     self.save_tokens()
 
                     self.logger.logMessage("[Auth] Access token successfully obtained and saved")
@@ -361,47 +479,66 @@ class EtradeConsumer:
 
     def save_tokens(self):
         """Save the current token data to disk with a timestamp."""
+        self._token_created_at = int(pyTime.time())
         with open(self.token_file, "w") as f:
             json.dump({
                 "oauth_token": self.oauth_token,
                 "oauth_token_secret": self.oauth_token_secret,
-                "created_at": int(pyTime.time())  # store as epoch
+                "created_at": self._token_created_at  # store as epoch
             }, f)
         self.token_status.set_status(True)
 
     # ------------------- HELPERS -------------------
+    @staticmethod
+    def _json(r):
+        """Decode a response body straight from bytes (orjson when available) instead of Response.json()."""
+        return json_utils.loads(r.content)
+
     def get_headers(self):
         return {"Content-Type": "application/json"}
 
     def load_encrypted_etrade_keysecret(self, sandbox=True):
-        with open("encryption/secret.key", "rb") as key_file:
-            key = key_file.read()
-        sandbox_suffix = "sandbox" if sandbox else "prod"
-        with open(f"encryption/etrade_consumer_key_{sandbox_suffix}.enc", "rb") as enc_file:
-            encrypted_key = enc_file.read()
-        with open(f"encryption/etrade_consumer_secret_{sandbox_suffix}.enc", "rb") as enc_file:
-            encrypted_secret = enc_file.read()
-        f = Fernet(key)
-        return f.decrypt(encrypted_key).decode(), f.decrypt(encrypted_secret).decode()
+        return load_etrade_keysecret(bool(sandbox))
 
     # ------------------- ACCOUNT / PORTFOLIO -------------------
     def get_accounts(self):
-        url = f"{self.base_url}/v1/accounts/list.json"
+        # The account list changes on a human timescale; serve it from memory for ACCOUNTS_CACHE_TTL
+        if self._accounts_cache and pyTime.monotonic() - self._accounts_cache_ts < ACCOUNTS_CACHE_TTL:
+            return list(self._accounts_cache)
+
+        url = self._url_accounts_list
         r = self.get(url)
         try:
-            accts = r.json().get("AccountListResponse", {}).get("Accounts", {}).get("Account", [])
-            return [Account(**acct) for acct in accts]
+            accts = self._json(r).get("AccountListResponse", {}).get("Accounts", {}).get("Account", [])
+            accounts = [Account(**acct) for acct in accts]
+            self._accounts_cache = accounts
+            self._accounts_cache_ts = pyTime.monotonic()
+            return list(accounts)
         except Exception as e:
             self.logger.logMessage(f"[ERROR] Failed to parse account ID: {e}")
             return []
 
     def get_positions(self):
         accounts = self.get_accounts()
+        if not accounts:
+            return []
+
+        def fetch(acct):
+            with self._request_gate:
+                return self.get(self._url_portfolio_tpl.format(acct.accountIdKey))
+
+        # Portfolio calls are independent round trips; issue them together and parse on this thread.
+        # Exceptions (e.g. TokenExpiredError) are re-raised here by map().
+        with ThreadPoolExecutor(max_workers=min(MAX_CHAIN_WORKERS, len(accounts)), thread_name_prefix="EtradePortfolio") as ex:
+            responses = list(ex.map(fetch, accounts))
+
         all_positions = []
-        for acct in accounts:
-            url = f"{self.base_url}/v1/accounts/{acct.accountIdKey}/portfolio.json"
-            r = self.get(url)
-            data = r.json()
+        for acct, r in zip(accounts, responses):
+            if r is None or not hasattr(r, "json"):
+                # session path returns None / (None, error) when the request itself failed
+                self.logger.logMessage(f"[ERROR] No portfolio response for account {acct.accountIdKey}")
+                continue
+            data = self._json(r)
             account_portfolios = data.get("PortfolioResponse", {}).get("AccountPortfolio", [])
             for acct_raw in account_portfolios:
                 portfolio = PortfolioAccount.from_dict(acct_raw)
@@ -418,7 +555,31 @@ class EtradeConsumer:
     # ------------------- OPTION CHAINS -------------------
     
     def get_expiry_dates(self, symbol):
-        url = f"{self.base_url}/v1/market/optionexpiredate.json"
+        """Expiry dates for symbol, cached per consumer (EXPIRY_CACHE_TTL; misses for bad symbols for EXPIRY_NEGATIVE_TTL)."""
+        cached = self._expiry_cache.get(symbol)
+        if cached is not None and cached[0] > pyTime.monotonic():
+            value = cached[1]
+            if isinstance(value, Exception):
+                raise type(value)(*value.args)
+            return list(value)
+
+        try:
+            value = self._fetch_expiry_dates(symbol)
+        except (InvalidSymbolError, NoExpiryError) as e:
+            # Negative entry: stops callers hammering the API for a symbol that has no expiries
+            self._cache_expiry(symbol, e, EXPIRY_NEGATIVE_TTL)
+            raise
+        self._cache_expiry(symbol, value, EXPIRY_CACHE_TTL)
+        return list(value)
+
+    def _cache_expiry(self, symbol, value, ttl):
+        cache = self._expiry_cache
+        if symbol not in cache and len(cache) >= EXPIRY_CACHE_MAXSIZE:
+            cache.pop(next(iter(cache)), None)  # drop the oldest insert
+        cache[symbol] = (pyTime.monotonic() + ttl, value)
+
+    def _fetch_expiry_dates(self, symbol):
+        url = self._url_option_expiredate
         params = {"symbol": symbol}
         try:
             response = self.get(url, params=params)
@@ -430,11 +591,16 @@ class EtradeConsumer:
             data = f"Ticker: {symbol}, Params: {params}"
             self.handle_exception(e,data)
             
+        if not getattr(response, "ok", False):
+            # No response, or a 429/5xx that outlived the adapter's retries: raise so
+            # get_expiry_dates doesn't cache an empty list for a transient error
+            status = getattr(response, "status_code", None)
+            raise Exception(f"Expiry dates request failed for {symbol}: HTTP {status}")
         if response.status_code == 204:
             raise NoExpiryError(f"Ticker returned no expiry dates")
 
         try:
-            data = response.json()
+            data = self._json(response)
             expiry_list = data.get("OptionExpireDateResponse", {}).get("ExpirationDate", [])
             # Return simplified dicts with year/month/day
             return [
@@ -446,7 +612,7 @@ class EtradeConsumer:
 
 
     def get_option_chain(self, symbol, date_range=None):
-        url = f"{self.base_url}/v1/market/optionchains.json"
+        url = self._url_option_chains
         params = {
             "symbol": symbol,
             "includeWeekly": "true",
@@ -466,143 +632,206 @@ class EtradeConsumer:
         elif "start" in date_range and "end" in date_range:
             # Range → fetch all, then filter
             all_expiries = self.get_expiry_dates(symbol=symbol)
-            start_y, start_m = date_range["start"]["year"], date_range["start"]["month"]
-            end_y, end_m = date_range["end"]["year"], date_range["end"]["month"]
+            start_key = (date_range["start"]["year"], date_range["start"]["month"])
+            end_key = (date_range["end"]["year"], date_range["end"]["month"])
+            expiry_dates = [exp for exp in all_expiries if start_key <= (exp["year"], exp["month"]) <= end_key]
+        else:
+            raise ValueError("date_range must be either {year, month} or {start:{}, end:{}}")
 
-            def in_range(exp):
-                y, m = exp["year"], exp["month"]
-                return (y > start_y or (y == start_y and m >= start_m)) and \
-                    (y < end_y or (y == end_y and m <= end_m))
+        if not expiry_dates:
+            return []
 
-            expiry_dates = [exp for exp in all_expiries if in_range(exp)]
+        local_tz = datetime.now().astimezone().tzinfo  # resolved once for every expiry
+
+        # One request per expiry: fan out on the shared keep-alive session, keep expiry order in the result
+        if len(expiry_dates) == 1:
+            chains = [self._fetch_chain_for_expiry(url, symbol, expiry_dates[0], params, local_tz)]
         else:
-            raise ValueError("date_range must be either {year, month} or {start:{}, end:{}}")
+            workers = min(MAX_CHAIN_WORKERS, len(expiry_dates))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="EtradeChain") as ex:
+                chains = list(ex.map(
+                    lambda expiry: self._fetch_chain_for_expiry(url, symbol, expiry, params, local_tz),
+                    expiry_dates,
+                ))
 
         results = []
+        for chain in chains:
+            results.extend(chain)
+        return results
 
-        # Loop across all target expiries
-        for expiry in expiry_dates:
-            params.update({
-                "expiryYear": expiry["year"],
-                "expiryMonth": expiry["month"],
-                "expiryDay": expiry["day"]
-            })
+    def _fetch_chain_for_expiry(self, url, symbol, expiry, base_params, local_tz) -> List[OptionContract]:
+        """Fetch and parse the CALL chain for a single expiry. Safe to run on several threads at once."""
+        params = dict(base_params)  # per-call copy: workers must not share one mutated dict
+        params.update({
+            "expiryYear": expiry["year"],
+            "expiryMonth": expiry["month"],
+            "expiryDay": expiry["day"]
+        })
 
-            try:
+        try:
+            with self._request_gate:
                 response = self.get(url, params=params)
-                self.inspect_response(symbol, response)
-            except Exception as e:
-                data = f"Ticker: {symbol}, Params: {str(params)}"
-                self.handle_exception(e,data)
+            self.inspect_response(symbol, response)
+        except Exception as e:
+            data = f"Ticker: {symbol}, Params: {str(params)}"
+            self.handle_exception(e,data)
 
-            # If we are here means response.ok == true
-            local_tz = datetime.now().astimezone().tzinfo
+        results = []
+        try:
+            chain_data = self._json(response).get("OptionChainResponse", {})
+            # The raw body is as large as the parsed tree; let it go before building contracts
+            response.close()
+            response = None
+            near_price = chain_data.get("nearPrice")
+            expiry_dict = chain_data.get("SelectedED", {})
+            expiry_date = datetime(
+                year=expiry_dict.get("year", 1970),
+                month=expiry_dict.get("month", 1),
+                day=expiry_dict.get("day", 1),
+                tzinfo=local_tz
+            )
 
-            try:
-                chain_data = response.json().get("OptionChainResponse", {})
-                near_price = chain_data.get("nearPrice")
-                expiry_dict = chain_data.get("SelectedED", {})
-                expiry_date = datetime(
-                    year=expiry_dict.get("year", 1970),
-                    month=expiry_dict.get("month", 1),
-                    day=expiry_dict.get("day", 1),
-                    tzinfo=local_tz
+            expiry_day, expiry_month, expiry_year = expiry_date.day, expiry_date.month, expiry_date.year
+            append = results.append
+            pairs = chain_data.pop("OptionPair", None) or []
+            for i, optionPair in enumerate(pairs):
+                pairs[i] = None  # release each raw pair once consumed, so peak memory doesn't hold both forms
+                call = optionPair.get("Call", {})
+                call["expiryDate"] = expiry_date
+                call["nearPrice"] = near_price
+                get = call.get
+                option_greeks = OptionGreeks(**get("OptionGreeks", {}))
+
+                call_symbol = get("symbol")
+                option_type = get("optionType")
+                product = Product(
+                    symbol=call_symbol,
+                    securityType=option_type,
+                    callPut="CALL" if option_type == "CALL" else "PUT",
+                    strikePrice=get("strikePrice"),
+                    productId=ProductId(symbol=call_symbol, typeCode=option_type),
+                    expiryDay=expiry_day,
+                    expiryMonth=expiry_month,
+                    expiryYear=expiry_year
                 )
 
-                for optionPair in chain_data.get("OptionPair", []):
-                    call = optionPair.get("Call", {})
-                    call["expiryDate"] = expiry_date
-                    call["nearPrice"] = near_price
-                    call_greeks = call.get("OptionGreeks", {})
-                    option_greeks = OptionGreeks(**call_greeks)
-
-                    product = Product(
-                        symbol=call.get("symbol"),
-                        securityType=call.get("optionType"),
-                        callPut="CALL" if call.get("optionType") == "CALL" else "PUT",
-                        strikePrice=call.get("strikePrice"),
-                        productId=ProductId(symbol=call.get("symbol"), typeCode=call.get("optionType")),
-                        expiryDay=expiry_date.day,
-                        expiryMonth=expiry_date.month,
-                        expiryYear=expiry_date.year
-                    )
-
-                    quick = Quick(
-                        lastTrade=call.get("lastPrice"),
-                        lastTradeTime=None,
-                        change=None,
-                        changePct=None,
-                        volume=call.get("volume"),
-                        quoteStatus=None
-                    )
+                quick = Quick(
+                    lastTrade=get("lastPrice"),
+                    lastTradeTime=None,
+                    change=None,
+                    changePct=None,
+                    volume=get("volume"),
+                    quoteStatus=None
+                )
 
-                    option_fields = {k: call[k] for k in [
-                        "symbol", "optionType", "strikePrice", "displaySymbol", "osiKey",
-                        "bid", "ask", "bidSize", "askSize", "inTheMoney", "volume",
-                        "openInterest", "netChange", "lastPrice", "quoteDetail",
-                        "optionCategory", "timeStamp", "adjustedFlag", "expiryDate", "nearPrice"
-                    ] if k in call}
-
-                    option = OptionContract(
-                        **option_fields,
-                        OptionGreeks=option_greeks,
-                        quick=quick,
-                        product=product
-                    )
+                # Every OptionContract field is Optional-compatible, so absent keys simply become None
+                option_fields = {k: get(k) for k in _OPTION_FIELDS}
 
-                    results.append(option)
-            except Exception as e:
-                errorMessage = f"[ERROR] Failed to parse option chain for {symbol}: {e}"
-                raise Exception(errorMessage)
+                append(OptionContract(
+                    **option_fields,
+                    OptionGreeks=option_greeks,
+                    quick=quick,
+                    product=product
+                ))
+        except Exception as e:
+            errorMessage = f"[ERROR] Failed to parse option chain for {symbol}: {e}"
+            raise Exception(errorMessage)
 
         return results
 
+    # ------------------- ASYNC WRAPPERS -------------------
+    async def aget_option_chain(self, symbol, date_range=None):
+        """Awaitable get_option_chain(); the pooled, parallel sync fetch runs in the loop's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.get_option_chain, symbol, date_range))
+
+    async def aget_option_chains(self, symbols, date_range=None):
+        """
+        Fetch chains for many symbols concurrently. Returns one entry per symbol, in order:
+        the contract list, or the exception raised for that symbol.
+        Total in-flight requests stay capped by the consumer's request gate.
+        """
+        return await asyncio.gather(
+            *(self.aget_option_chain(symbol, date_range) for symbol in symbols),
+            return_exceptions=True,
+        )
+
+    async def aget_positions(self):
+        """Awaitable get_positions()."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_positions)
+
     # ------------------- QUOTES -------------------
     def get_quote(self, symbol):
-        url = f"{self.base_url}/v1/market/quote/{symbol}.json"
-        r,error= self.get(url)
-        try:
-            qdata = r.json().get("QuoteResponse", {}).get("QuoteData", [])[0]
-            product = Product(symbol=symbol)
-            quick = Quick(
-                lastTrade=qdata.get("lastTrade"),
-                lastTradeTime=None,
-                change=qdata.get("change"),
-                changePct=qdata.get("changePct"),
-                volume=qdata.get("volume"),
-                quoteStatus=qdata.get("quoteStatus")
-            )
-            return Position(Product=product, Quick=quick)
-        except Exception as e:
-            self.logger.logMessage(f"[ERROR] Failed to parse quote for {symbol}: {e}")
-            return None
-        
+        quotes = self.get_quotes([symbol])
+        return quotes[0] if quotes else None
+
+    def get_quotes(self, symbols) -> List[Position]:
+        """Quotes for many symbols, QUOTE_BATCH_SIZE per request (the endpoint takes a comma-separated list)."""
+        symbols = list(symbols)
+        positions = []
+        for i in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            chunk = symbols[i:i + QUOTE_BATCH_SIZE]
+            url = self._url_quote_tpl.format(",".join(chunk))
+            r = self.get(url)
+            if r is None or not hasattr(r, "content"):
+                self.logger.logMessage(f"[ERROR] No quote response for {chunk}")
+                continue
+            try:
+                quote_data = self._json(r).get("QuoteResponse", {}).get("QuoteData", [])
+            except Exception as e:
+                self.logger.logMessage(f"[ERROR] Failed to parse quotes for {chunk}: {e}")
+                continue
+            for qdata in quote_data:
+                qproduct = qdata.get("Product", {})
+                product = Product(symbol=qproduct.get("symbol"), securityType=qproduct.get("securityType"))
+                quick = Quick(
+                    lastTrade=qdata.get("lastTrade"),
+                    lastTradeTime=None,
+                    change=qdata.get("change"),
+                    changePct=qdata.get("changePct"),
+                    volume=qdata.get("volume"),
+                    quoteStatus=qdata.get("quoteStatus")
+                )
+                positions.append(Position(Product=product, Quick=quick))
+        return positions
+
     def handle_exception(self,e, data):
         if isinstance(e,NoOptionsError):
             write_scratch(f"Exception: {str(e)} | Data: {data}")
         raise e
     
+    @staticmethod
+    def _etrade_error_code(body):
+        """
+        E*TRADE error code from an error body ({"Error": {"code": ...}}), or None.
+        Falls back to a substring scan for the codes we act on when the body isn't that JSON shape.
+        """
+        try:
+            return int(json_utils.loads(body)["Error"]["code"])
+        except Exception:
+            pass
+        if isinstance(body, (bytes, bytearray)):
+            body = body.decode("utf-8", "replace")
+        for code in (ERR_INVALID_SYMBOL, *ERR_NO_OPTIONS):
+            if str(code) in body:
+                return code
+        return None
+
     def inspect_response(self,symbol, response):
         if response is None:
             raise Exception("No Response info was received")
-        elif not response.ok:
-            if response.status_code == 400:
-                raise NoOptionsError(f"No Options received for {symbol}")
-            elif response.status_code == 408:
-                raise TimeoutError(f"Timeout received when processing options for {symbol}")
-
-            try:
-                error = json.loads(response.text)
-                error_code = error["Error"]["code"]
-
-                if error_code == 10033 or "10033" in error:
-                    raise InvalidSymbolError(f"Invalid symbol for {symbol}")
-                elif error_code in (10031, 10032) or "10031" in error or "10032" in error:
-                    raise NoOptionsError(f"No Options available for ticker: {symbol}")
-                else:
-                    raise Exception(error)
-            except Exception as e:
-                raise Exception(f"Error parsing response error for ticker {symbol}: {e}") 
+        if response.ok:
+            return
+        if response.status_code == 408:
+            raise TimeoutError(f"Timeout received when processing options for {symbol}")
+
+        code = self._etrade_error_code(response.content)
+        if code == ERR_INVALID_SYMBOL:
+            raise InvalidSymbolError(f"Invalid symbol for {symbol}")
+        if code in ERR_NO_OPTIONS or response.status_code == 400:
+            raise NoOptionsError(f"No Options available for ticker: {symbol}")
+        raise Exception(f"Error response for ticker {symbol}: {response.status_code} {response.text}")
 
 
 # ------------------- FORCE TOKEN GENERATION (OUTSIDE CLASS) -------------------
@@ -1,45 +1,133 @@
 import os
-import json
-import webbrowser
+import sys
+import asyncio
+import functools
+import tempfile
+import threading
 import time as pyTime
-from datetime import datetime, timezone
-from cryptography.fernet import Fernet
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from requests_oauthlib import OAuth1Session
-from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote
 from shared_options.models.Account import Account, PortfolioAccount
 from shared_options.models.Position import Position
 from shared_options.models.option import OptionContract,Product,Quick,OptionGreeks,ProductId
+from shared_options.encryption.encryptItems import load_etrade_keysecret
+from shared_options.services import json_utils
 
 TOKEN_LIFETIME_DAYS = 90
+# Tokens younger than TOKEN_LIFETIME_DAYS - REFRESH_MARGIN_DAYS are trusted without an API probe
+REFRESH_MARGIN_DAYS = 5
+
+# Keep-alive connection pool + retry policy mounted on every session
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,  # 0.5s, 1s, 2s
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+# Upper bound on concurrent requests fanned out by one call
+MAX_WORKERS = 8
+# Max symbols per /market/quote request
+QUOTE_BATCH_SIZE = 25
+# Same host for sandbox and prod; the user approves the request token here
+AUTHORIZE_BASE = "https://us.etrade.com/e/t/etws/authorize"
 
 
 class EtradeConsumerLite:
-    def __init__(self, sandbox=False):
+    _ACCEPT_JSON = {"Accept": "application/json"}  # read-only; passed to requests as-is
+
+    # Process-wide consumers handed out by instance(), one per environment (which also fixes the token file)
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, sandbox=False):
+        """
+        Shared consumer for this process. Key/secret decryption, token load/validation and the pooled
+        session happen once; later callers get the same object. close() drops it so the next call rebuilds.
+        """
+        key = bool(sandbox)
+        with cls._instances_lock:
+            consumer = cls._instances.get(key)
+            if consumer is None:
+                consumer = cls._instances[key] = cls(sandbox=key)
+            return consumer
+
+    def __init__(self, sandbox=False, refresh_margin_days=REFRESH_MARGIN_DAYS):
         self.sandbox = sandbox        
+        self.refresh_margin_days = refresh_margin_days
+        self._refresh_timer = None
+        self._refresh_due = threading.Event()  # set by the refresh timer, acted on by the next get() on the main thread
+        self._auth_lock = threading.Lock()
+        self._token_generation = 0
+        self._saved_tokens = None  # (token, secret) currently on disk
+        self._async_executor = None  # created by the first a* call
         envType = "nonProd" if sandbox else "prod"
 
-        self.consumer_key, self.consumer_secret = self.load_encrypted_etrade_keysecret(sandbox)
+        # Process-wide cache (lru_cache in encryptItems): only the first consumer touches disk or decrypts
+        self.consumer_key, self.consumer_secret = load_etrade_keysecret(bool(sandbox))
         self.token_file = os.path.join("encryption", f"etrade_tokens_{envType}.json")
         self.base_url = "https://apisb.etrade.com" if sandbox else "https://api.etrade.com"
+        # Endpoint URLs are fixed per consumer; build them once
+        self._url_accounts_list = f"{self.base_url}/v1/accounts/list.json"
+        self._url_portfolio_tpl = f"{self.base_url}/v1/accounts/{{}}/portfolio.json"
+        self._url_option_expiredate = f"{self.base_url}/v1/market/optionexpiredate.json"
+        self._url_option_chains = f"{self.base_url}/v1/market/optionchains.json"
+        self._url_quote_tpl = f"{self.base_url}/v1/market/quote/{{}}.json"
 
         if not self.consumer_key:
             raise Exception("Missing E*TRADE consumer key")
 
-        if not os.path.exists(self.token_file):
+        token_data = self._read_token_file()
+        if token_data is None:
             print("No token file found. Starting OAuth...")
             if not self.generate_token():
                 raise Exception("Failed to generate access token.")
         else:
-            self.load_tokens()
-
+            self.load_tokens(_token_data=token_data)
+
+
+    def close(self):
+        """Stop the refresh timer and release pooled connections."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if self._async_executor is not None:
+            self._async_executor.shutdown(wait=False)
+            self._async_executor = None
+        session = getattr(self, "session", None)
+        if session is not None:
+            session.close()
+        with self._instances_lock:
+            if self._instances.get(bool(self.sandbox)) is self:
+                del self._instances[bool(self.sandbox)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def get(self, url: str, headers=None, params=None):
-        # Existing headers (may be None)
-        headers = headers or {}  # ensure it's a dict
-
-        # Add/overwrite Accept header
-        headers.update({"Accept": "application/json"})
-        
+        if self._refresh_due.is_set():
+            self._run_due_refresh()
+        # Shared constant when the caller has no headers; otherwise merge with Accept overriding
+        headers = {**headers, **self._ACCEPT_JSON} if headers else self._ACCEPT_JSON
+
+        # Transient 429/5xx are retried with backoff by the mounted adapter; a 401 gets one re-auth + retry
+        generation = self._token_generation
+        r = self._get_once(url, headers, params)
+        if r is not None and r.status_code == 401 and self._reauth_after_401(generation):
+            r = self._get_once(url, headers, params)
+        return r
+
+    def _get_once(self, url, headers, params):
         try:
             return self.session.get(url, headers=headers, params=params)
         
@@ -48,34 +136,65 @@ class EtradeConsumerLite:
             print(error)
             return None
 
+    def _reauth_after_401(self, generation) -> bool:
+        """
+        Called after a 401. Returns True when a different token is now installed and the request is worth retrying.
+        Never prompts: this runs on pool workers too (get_positions). Serialized by a lock so concurrent
+        workers share one reload of the token file (another process may have refreshed it); the rest see
+        the bumped generation and just retry. Otherwise the 401 goes back to the caller.
+        """
+        with self._auth_lock:
+            if self._token_generation != generation:
+                return True
+            token_data = self._read_token_file() or {}
+            token = token_data.get("oauth_token")
+            secret = token_data.get("oauth_token_secret")
+            if not token or not secret or (token, secret) == (self.oauth_token, self.oauth_token_secret):
+                print("[Auth] 401 received and no refreshed token on disk; run the OAuth flow to renew it")
+                return False
+            self.oauth_token, self.oauth_token_secret = token, secret
+            self._saved_tokens = (token, secret)
+            self._install_tokens(token, secret)
+            self._schedule_refresh(int(token_data.get("created_at", 0)))
+            print("[Auth] 401 received; picked up refreshed token from token file")
+            return True
+
     # ------------------- TOKENS -------------------
-    def load_tokens(self, generate_new_token=True):
-        """Load saved tokens or generate if missing/expired."""
-        token_data = {}
-        if os.path.exists(self.token_file):
-            with open(self.token_file, "r") as f:
-                token_data = json.load(f)
+    def _read_token_file(self):
+        """Parsed token file, or None when it does not exist (one open, no separate exists() check)."""
+        try:
+            with open(self.token_file, "rb") as f:
+                return json_utils.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    def load_tokens(self, generate_new_token=True, _token_data=None):
+        """
+        Load saved tokens or generate if missing/expired.
+        _token_data lets __init__ hand over the file it already parsed instead of reading it again.
+        """
+        token_data = _token_data if _token_data is not None else (self._read_token_file() or {})
 
         self.oauth_token = token_data.get("oauth_token")
         self.oauth_token_secret = token_data.get("oauth_token_secret")
-        created_at = token_data.get("created_at", 0)
+        created_at = int(token_data.get("created_at", 0))
+        if token_data:
+            self._saved_tokens = (self.oauth_token, self.oauth_token_secret)
 
         # Build OAuth1 session if we have tokens
         if self.oauth_token and self.oauth_token_secret:
-            self.session = OAuth1Session(
-                self.consumer_key,
-                client_secret=self.consumer_secret,
-                resource_owner_key=self.oauth_token,
-                resource_owner_secret=self.oauth_token_secret,
-            )
-
-        # Check token age
-        local_tz = datetime.now().astimezone().tzinfo
-        token_age_days = (datetime.now().astimezone() - datetime.fromtimestamp(created_at, tz=local_tz)).days
+            self._install_tokens(self.oauth_token, self.oauth_token_secret)
+
+        # Check token age (both sides are epoch seconds, so no timezone handling is needed)
+        token_age_days = (int(pyTime.time()) - created_at) // 86400
         if (not self.oauth_token or token_age_days >= TOKEN_LIFETIME_DAYS) and generate_new_token:
             print(f"Token missing or expired (age={token_age_days}d). Generating new token...")
             if not self.generate_token():
                 raise Exception("Failed to generate new OAuth token.")
+        elif self.oauth_token and token_age_days < TOKEN_LIFETIME_DAYS - self.refresh_margin_days:
+            # Well inside its lifetime: trust created_at instead of a synchronous API round trip
+            print(f"Loaded token (age={token_age_days}d)")
+            self._schedule_refresh(created_at)
         else:
             # Extra check: make sure the token actually works with the API
             if not self._check_session_valid():
@@ -90,6 +209,61 @@ class EtradeConsumerLite:
 
 
 
+    def _install_tokens(self, oauth_token, oauth_token_secret):
+        """
+        Point the session at a new access token. The first call builds the session; later calls
+        swap the OAuth1 signing credentials in place, keeping the warmed connection pool.
+        """
+        session = getattr(self, "session", None)
+        if session is None:
+            self.session = self._build_session(oauth_token, oauth_token_secret)
+        else:
+            session.token = {"oauth_token": oauth_token, "oauth_token_secret": oauth_token_secret}
+        self._token_generation += 1
+
+    def _build_session(self, oauth_token, oauth_token_secret) -> OAuth1Session:
+        """OAuth1 session with a pooled keep-alive adapter and retry/backoff on transient errors."""
+        session = OAuth1Session(
+            self.consumer_key,
+            client_secret=self.consumer_secret,
+            resource_owner_key=oauth_token,
+            resource_owner_secret=oauth_token_secret,
+        )
+        session.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=HTTP_RETRY))
+        return session
+
+    def _schedule_refresh(self, created_at):
+        """Arm a daemon timer that refreshes the token once it enters the refresh margin."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_due.clear()  # a freshly installed token restarts the countdown
+        due = created_at + (TOKEN_LIFETIME_DAYS - self.refresh_margin_days) * 86400
+        self._refresh_timer = threading.Timer(max(0.0, due - pyTime.time()), self._refresh_token)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_token(self):
+        """
+        Timer callback: only flags the refresh. The OAuth flow prompts on stdin, so it must not run on
+        this daemon thread; the next get() made on the main thread runs it (see _run_due_refresh).
+        """
+        self._refresh_timer = None
+        print(f"[Auth] Token is within {self.refresh_margin_days}d of expiry; it will be refreshed on the next call")
+        self._refresh_due.set()
+
+    def _run_due_refresh(self):
+        """Run a refresh flagged by the timer, but only on the main thread (never from pool workers)."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        with self._auth_lock:
+            if not self._refresh_due.is_set():
+                return
+            self._refresh_due.clear()
+            if sys.stdin.isatty():
+                self.generate_token()
+            else:
+                print("[Auth] Not interactive; run the OAuth flow to refresh the token before it expires")
+
     def _validate_tokens(self):
         """
         Validate current tokens; attempt refresh first.
@@ -106,7 +280,7 @@ class EtradeConsumerLite:
     def _check_session_valid(self):
         """Simple API test to check if the current session is valid."""
         try:
-            url = f"{self.base_url}/v1/accounts/list.json"
+            url = self._url_accounts_list
             r = self.get(url)
             return r and getattr(r, "status_code", 200) == 200
         except Exception as e:
@@ -136,9 +310,7 @@ class EtradeConsumerLite:
                 return
 
             # Step 2: Provide user the authorization URL            
-            authorize_base = "https://us.etrade.com/e/t/etws/authorize"
-            params = {"key": self.consumer_key, "token": resource_owner_key}
-            authorization_url = f"{authorize_base}?{urlencode(params)}"
+            authorization_url = f"{AUTHORIZE_BASE}?key={quote(self.consumer_key, safe='')}&token={quote(resource_owner_key, safe='')}"
             print(f"[Auth] Please go to this URL and authorize: {authorization_url}")
 
             # Step 3: Prompt for PIN until success, restart, or exit
@@ -171,13 +343,9 @@ class EtradeConsumerLite:
                     # Store tokens
                     self.oauth_token = access_token_response.get("oauth_token")
                     self.oauth_token_secret = access_token_response.get("oauth_token_secret")                    # Persist to disk
-                    self.session = OAuth1Session(
-                        self.consumer_key,
-                        client_secret=self.consumer_secret,
-                        resource_owner_key=self.oauth_token,
-                        resource_owner_secret=self.oauth_token_secret,
-                    )                    
+                    self._install_tokens(self.oauth_token, self.oauth_token_secret)
                     self.save_tokens()
+                    self._schedule_refresh(int(pyTime.time()))
 
                     print("[Auth] Access token successfully obtained and saved")
                     return True
@@ -191,35 +359,52 @@ class EtradeConsumerLite:
 
 
     def save_tokens(self):
-        """Save the current token data to disk with a timestamp."""
-        with open(self.token_file, "w") as f:
-            json.dump({
-                "oauth_token": self.oauth_token,
-                "oauth_token_secret": self.oauth_token_secret,
-                "created_at": int(pyTime.time())  # store as epoch
-            }, f)
+        """
+        Save the current token data to disk with a timestamp.
+        Written to a temp file and renamed over the old one, so a crash mid-write never leaves a torn
+        file that would force the interactive OAuth flow on the next start. Unchanged tokens are not
+        rewritten, which also keeps their original created_at.
+        """
+        tokens = (self.oauth_token, self.oauth_token_secret)
+        if tokens == self._saved_tokens:
+            return
+        payload = json_utils.dumps({
+            "oauth_token": self.oauth_token,
+            "oauth_token_secret": self.oauth_token_secret,
+            "created_at": int(pyTime.time())  # store as epoch
+        })
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.token_file) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.token_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._saved_tokens = tokens
 
     # ------------------- HELPERS -------------------
+    @staticmethod
+    def _json(r):
+        """Decode a response body straight from bytes (orjson when available) instead of Response.json()."""
+        return json_utils.loads(r.content)
+
     def get_headers(self):
         return {"Content-Type": "application/json"}
 
     def load_encrypted_etrade_keysecret(self, sandbox=True):
-        with open("encryption/secret.key", "rb") as key_file:
-            key = key_file.read()
-        sandbox_suffix = "sandbox" if sandbox else "prod"
-        with open(f"encryption/etrade_consumer_key_{sandbox_suffix}.enc", "rb") as enc_file:
-            encrypted_key = enc_file.read()
-        with open(f"encryption/etrade_consumer_secret_{sandbox_suffix}.enc", "rb") as enc_file:
-            encrypted_secret = enc_file.read()
-        f = Fernet(key)
-        return f.decrypt(encrypted_key).decode(), f.decrypt(encrypted_secret).decode()
+        """Kept for callers of the old instance method; delegates to the cached module-level loader."""
+        return load_etrade_keysecret(bool(sandbox))
 
     # ------------------- ACCOUNT / PORTFOLIO -------------------
     def get_accounts(self):
-        url = f"{self.base_url}/v1/accounts/list.json"
+        url = self._url_accounts_list
         r = self.get(url)
         try:
-            accts = r.json().get("AccountListResponse", {}).get("Accounts", {}).get("Account", [])
+            accts = self._json(r).get("AccountListResponse", {}).get("Accounts", {}).get("Account", [])
             return [Account(**acct) for acct in accts]
         except Exception as e:
             print(f"[ERROR] Failed to parse account ID: {e}")
@@ -227,16 +412,27 @@ class EtradeConsumerLite:
 
     def get_positions(self):
         accounts = self.get_accounts()
-        all_positions = []
-        for acct in accounts:
-            url = f"{self.base_url}/v1/accounts/{acct.accountIdKey}/portfolio.json"
-            r = self.get(url)
-            data = r.json()
-            account_portfolios = data.get("PortfolioResponse", {}).get("AccountPortfolio", [])
-            for acct_raw in account_portfolios:
-                portfolio = PortfolioAccount.from_dict(acct_raw)
-                all_positions.extend(portfolio.Position or [])
-        return all_positions
+        if not accounts:
+            return []
+        urls = [self._url_portfolio_tpl.format(acct.accountIdKey) for acct in accounts]
+
+        # Independent round trips over the pooled session: latency is the slowest account, not the sum
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(urls))) as ex:
+            responses = list(ex.map(self.get, urls))
+
+        payloads = []
+        for url, r in zip(urls, responses):
+            if r is None:
+                print(f"[ERROR] No portfolio response for {url}")
+                continue
+            payloads.append(self._json(r))
+
+        from_dict = PortfolioAccount.from_dict
+        return list(chain.from_iterable(
+            from_dict(acct_raw).Position or []
+            for data in payloads
+            for acct_raw in data.get("PortfolioResponse", {}).get("AccountPortfolio", [])
+        ))
     
         #How much capital is currently outstanding (ie don't buy more than comfortable)
     def get_open_exposure(self):
@@ -247,7 +443,7 @@ class EtradeConsumerLite:
 
     # ------------------- OPTION CHAINS -------------------
     def get_expiry_dates(self, symbol):
-        url = f"{self.base_url}/v1/market/optionexpiredate.json"
+        url = self._url_option_expiredate
         params = {"symbol": symbol}
         try:
             response = self.get(url, params=params)
@@ -258,14 +454,20 @@ class EtradeConsumerLite:
             return None
 
         try:
-            return response.json()
+            return self._json(response)
         except:
             return str(response)
         
         
         
-    def get_option_chain(self, symbol):
-        url = f"{self.base_url}/v1/market/optionchains.json"
+    def get_option_chain(self, symbol, expiry=None):
+        """
+        Raw option chain JSON for symbol.
+        expiry is an optional (year, month, day) tuple; any part may be None. When it is omitted and
+        stdin is a terminal the user is prompted for it, otherwise the chain is requested unfiltered,
+        so batch callers never block on input().
+        """
+        url = self._url_option_chains
         params = {
             "symbol": symbol,
             "includeWeekly": "true",
@@ -274,7 +476,9 @@ class EtradeConsumerLite:
             "chainType": "CALL",
         }
         
-        month,year,day = get_valid_month_year_day()
+        if expiry is None:
+            expiry = get_valid_month_year_day() if sys.stdin.isatty() else (None, None, None)
+        year, month, day = expiry
         if month is not None:
             params.update({"expiryMonth": month})
         if year is not None:
@@ -288,34 +492,92 @@ class EtradeConsumerLite:
             return None
 
         try:
-            return r.json()
+            return self._json(r)
         except Exception as e:
             print(f"[ERROR] Failed to parse option chain for {symbol}: {str(e)}")
             return None
 
+    # ------------------- ASYNC WRAPPERS -------------------
+    def _run_async(self, fn, *args):
+        """
+        Run a blocking call on this consumer's executor. It is sized to the session's connection pool,
+        so a large gather() keeps every pooled connection busy without queueing for sockets.
+        """
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix="etrade-lite")
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._async_executor, functools.partial(fn, *args))
+
+    async def aget_option_chain(self, symbol, expiry=(None, None, None)):
+        """Awaitable get_option_chain(). Never prompts: expiry defaults to unfiltered."""
+        return await self._run_async(self.get_option_chain, symbol, expiry)
+
+    async def aget_option_chains(self, symbols, expiry=(None, None, None)):
+        """
+        Fetch chains for many symbols concurrently. Returns one entry per symbol, in order:
+        the chain JSON, or the exception raised for that symbol.
+        """
+        return await asyncio.gather(
+            *(self.aget_option_chain(symbol, expiry) for symbol in symbols),
+            return_exceptions=True,
+        )
+
+    async def aget_quotes(self, symbols):
+        """Awaitable get_quotes(); QUOTE_BATCH_SIZE batches are fetched concurrently."""
+        symbols = list(symbols)
+        batches = await asyncio.gather(*(
+            self._run_async(self.get_quotes, symbols[i:i + QUOTE_BATCH_SIZE])
+            for i in range(0, len(symbols), QUOTE_BATCH_SIZE)
+        ))
+        return list(chain.from_iterable(batches))
+
+    async def aget_positions(self):
+        """Awaitable get_positions()."""
+        return await self._run_async(self.get_positions)
+
     # ------------------- QUOTES -------------------
     def get_quote(self, symbol):
-        url = f"{self.base_url}/v1/market/quote/{symbol}.json"
-        r= self.get(url)
-        try:
-            qdata = r.json().get("QuoteResponse", {}).get("QuoteData", [])[0]
-            product = Product(symbol=symbol)
-            quick = Quick(
-                lastTrade=qdata.get("lastTrade"),
-                lastTradeTime=None,
-                change=qdata.get("change"),
-                changePct=qdata.get("changePct"),
-                volume=qdata.get("volume"),
-                quoteStatus=qdata.get("quoteStatus")
-            )
-            return Position(Product=product, Quick=quick)
-        except Exception as e:
-            print(f"[ERROR] Failed to parse quote for {symbol}: {e}")
-            return None
+        quotes = self.get_quotes([symbol])
+        return quotes[0] if quotes else None
+
+    def get_quotes(self, symbols):
+        """Quotes for many symbols, QUOTE_BATCH_SIZE per request (the endpoint takes a comma-separated list)."""
+        symbols = list(symbols)
+        positions = []
+        for i in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            batch = symbols[i:i + QUOTE_BATCH_SIZE]
+            r = self.get(self._url_quote_tpl.format(",".join(batch)))
+            if r is None:
+                continue
+            try:
+                quote_data = self._json(r).get("QuoteResponse", {}).get("QuoteData", [])
+            except Exception as e:
+                print(f"[ERROR] Failed to parse quotes for {batch}: {e}")
+                continue
+            for qdata in quote_data:
+                qproduct = qdata.get("Product", {})
+                product = Product(symbol=qproduct.get("symbol"), securityType=qproduct.get("securityType"))
+                quick = Quick(
+                    lastTrade=qdata.get("lastTrade"),
+                    lastTradeTime=None,
+                    change=qdata.get("change"),
+                    changePct=qdata.get("changePct"),
+                    volume=qdata.get("volume"),
+                    quoteStatus=qdata.get("quoteStatus")
+                )
+                positions.append(Position(Product=product, Quick=quick))
+        return positions
 
 
 # ------------------- Helpers -------------------- #
-import calendar
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def days_in_month(year, month):
+    """Same result as calendar.monthrange(year, month)[1], without the weekday computation."""
+    leap = month == 2 and (year % 4 == 0 and year % 100 != 0 or year % 400 == 0)
+    return DAYS_IN_MONTH[month - 1] + leap
+
 
 def get_valid_month_year_day():
     # Month
@@ -351,7 +613,7 @@ def get_valid_month_year_day():
     # Day (only if month and year provided)
     day = None
     if month is not None and year is not None:
-        _, max_day = calendar.monthrange(year, month)  # (weekday, number_of_days)
+        max_day = days_in_month(year, month)
         while True:
             day_str = input(f"Enter day (1-{max_day}, or leave blank for None): ").strip()
             if not day_str:
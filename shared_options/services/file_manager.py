@@ -1,20 +1,46 @@
-import json
+import ctypes
+import errno
+import operator
 import threading
 import time
 import os
 import shutil
+import sys
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Union
 
 from shared_options.services.shutdown_handler import ShutdownManager
 from shared_options.log.logger_singleton import getLogger
 from shared_options.services.utils import try_send
+from shared_options.services import json_utils
 
 # --- Tunables ---
 DEFAULT_LOW_SPACE_BYTES = 200 * 1024 * 1024    # 200 MB - warning threshold
 DEFAULT_CRITICAL_SPACE_BYTES = 50 * 1024 * 1024 # 50 MB - emergency cleanup threshold
 DEFAULT_BACKOFF_SECONDS = 5                     # backoff after disk error
+DEFAULT_TARGET_FLUSH_BYTES = 256 * 1024         # aim for temp files of about this size
+FLUSH_EMA_ALPHA = 0.2                           # weight of the newest flush in the size/rate averages
+MIN_FLUSH_WAIT = 0.05                           # floor on the flush loop's sleep
+DISK_SAMPLE_INTERVAL = 2.0                      # seconds a statvfs() free-space sample is reused
+DIR_FSYNC_EVERY = 16                            # temp_dir is fsync'd after this many new temp files...
+DIR_FSYNC_INTERVAL = 1.0                        # ...or when this many seconds passed since the last one
+FAST_FLUSH_HEADROOM = 2                         # fast flush path needs free space >= low_space_bytes * this
+SEND_WORKERS = 2                                # concurrent bundle uploads per FileManager
+BACKPRESSURE_FACTOR = 4                         # producers flush inline past max_buffer_size * this
+BUNDLE_IO_BUFFER = 1024 * 1024                  # read/write buffer when streaming temp files into a bundle
+
+# Temp files are not JSONL: each record ends in ",\n" rather than "\n", so a whole temp file is
+# a valid run of JSON-array elements and can be copied into a bundle in-kernel (copy_file_range)
+# untouched. Lines stay one record each, so the line-by-line fallback still reads them.
+TEMP_RECORD_TERMINATOR = b",\n"
+TEMP_SUFFIX = ".records"
+# Temp files written before the ",\n" format (true JSONL); still picked up and bundled line by line
+LEGACY_TEMP_SUFFIX = ".jsonl"
+_copy_file_range = getattr(os, "copy_file_range", None)  # Linux 4.5+, Python 3.8+
 
 def _safe_iso_timestamp():
     # filesystem-safe timestamp: no colons
@@ -28,13 +54,70 @@ def _has_free_space(path: Path, min_free: int) -> tuple[bool, int]:
         # If we can't determine, assume it's okay (avoid false positives)
         return True, 10**12
 
+def _load_sync_file_range():
+    """libc sync_file_range(2) via ctypes (Linux only; os has no wrapper), or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).sync_file_range
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = (ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint)
+    fn.restype = ctypes.c_int
+    return fn
+
+_sync_file_range = _load_sync_file_range()
+SYNC_FILE_RANGE_WRITE = 2  # start writeback of dirty pages; don't wait for it
+
+def _async_writeback(fd: int):
+    """Ask the kernel to start writing the file out now, without waiting (no-op where unsupported)."""
+    if _sync_file_range is not None:
+        _sync_file_range(fd, 0, 0, SYNC_FILE_RANGE_WRITE)
+
+# O_BINARY keeps Windows from translating newlines on raw fd writes
+_TEMP_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _identity(entry):
+    return entry
+
+def _model_dump_json(entry):
+    return entry.model_dump(mode="json")
+
+def _legacy_dict(entry):
+    return entry.dict()
+
+def _pick_normalizer(t: type) -> Callable:
+    """Resolve add_entry's type dispatch once per class (same precedence as the old if/elif chain)."""
+    if issubclass(t, (bytes, bytearray)):
+        return _identity
+    if hasattr(t, "model_dump"):
+        return _model_dump_json
+    if hasattr(t, "dict"):
+        return _legacy_dict
+    if is_dataclass(t):
+        # Slotted model dataclasses have no __dict__
+        return asdict
+    if issubclass(t, dict):
+        return _identity
+    return operator.attrgetter("__dict__")
+
+# type -> callable turning an entry into something json_utils can write; filled lazily
+_NORMALIZERS: Dict[type, Callable] = {}
+
+def _write_all(fd: int, data: bytes):
+    """os.write() until every byte is written (regular files rarely short-write, but may)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
 class FileManager:
     """
-    Thread-safe file manager that buffers entries into temp JSONL files.
+    Thread-safe file manager that buffers entries into numbered temp record files.
 
     Features:
-      * Writes batches to numbered .jsonl files under a temp dir (atomic writes).
-      * Safely combines jsonl files into bundles and optionally sends them with try_send().
+      * Writes batches to numbered .records files under a temp dir (atomic writes); one
+        record per line, each terminated by ",\n" (see TEMP_RECORD_TERMINATOR).
+      * Safely combines temp files into JSON-array bundles and optionally sends them with try_send().
       * Resumes numbering from existing files on init.
       * Guards against disk-full hangs using pre-write checks, backoff, and emergency cleanup.
       * Non-blocking upload (sending happens in background to avoid blocking writer).
@@ -50,26 +133,55 @@ class FileManager:
         low_space_bytes: int = DEFAULT_LOW_SPACE_BYTES,
         critical_space_bytes: int = DEFAULT_CRITICAL_SPACE_BYTES,
         backoff_seconds: int = DEFAULT_BACKOFF_SECONDS,
+        target_flush_bytes: int = DEFAULT_TARGET_FLUSH_BYTES,
     ):
         self.filepath = Path(filepath)
         self.temp_dir = self.filepath.parent / f"{self.filepath.stem}_tmp"
         self.flush_interval = flush_interval
         self.max_buffer_size = max_buffer_size
-        self._buffer: List[dict] = []
+        # deque.append/popleft are atomic, so producers append without taking _lock;
+        # the lock only serializes flushes (which drain from the left, oldest first)
+        self._buffer: Deque[Union[dict, bytes]] = deque()
         self._lock = threading.RLock()
         self._stop_event = stop_event or threading.Event()
+        # Set by producers when the buffer reaches the flush threshold, and by close()
+        self._wake = threading.Event()
         self.logger = getLogger()
 
         self.low_space_bytes = low_space_bytes
         self.critical_space_bytes = critical_space_bytes
         self.backoff_seconds = backoff_seconds
+        # Cached free-space sample (see _check_space); writes and cleanup adjust it between samples
+        self._free_bytes = 0
+        self._free_sampled_at = float("-inf")
+
+        # Adaptive batching: running averages of record size and arrival rate turn
+        # target_flush_bytes into an entry threshold (capped by max_buffer_size) and
+        # let the flush loop wake when that threshold should be reached
+        self.target_flush_bytes = target_flush_bytes
+        self._ema_bytes_per_entry = 0.0
+        self._ema_entries_per_sec = 0.0
+        self._flush_threshold = max_buffer_size
+        self._last_flush_ts = time.monotonic()
 
         # Ensure directories exist
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
         # Continue numbering from existing files
-        self._temp_file_counter = self._init_temp_counter()
+        # Ordered index of finished temp files (oldest first); one directory scan here, then
+        # maintained in memory: appended by writes, taken by combines, trimmed by cleanup
+        existing_files = self._scan_temp_files()
+        self._pending: Deque[Path] = deque(existing_files)
+        self._pending_lock = threading.Lock()
+        self._temp_file_counter = self._init_temp_counter(existing_files)
+
+        self._copy_file_range_ok = True
+        self._dir_dirty = 0  # temp files named since temp_dir was last fsync'd
+        self._last_dir_fsync = time.monotonic()
+
+        # Directory fd kept open for syncing temp-file renames (None where O_DIRECTORY is unsupported)
+        self._temp_dir_fd = self._open_dir_fd(self.temp_dir)
 
         # Initialize main file if missing (keep prior behavior)
         if not self.filepath.exists():
@@ -92,6 +204,10 @@ class FileManager:
                 lambda reason=None: self.close()
             )
 
+        # Uploads run on a small reusable pool instead of a new thread per bundle;
+        # two workers also bound how many try_send() calls run at once
+        self._send_executor = ThreadPoolExecutor(max_workers=SEND_WORKERS, thread_name_prefix=f"FM-send-{self.filepath.name}")
+
         # Background flush loop
         self._thread = threading.Thread(target=self._flush_loop, daemon=True, name=f"FileManagerFlush-{self.filepath.name}")
         self._thread.start()
@@ -101,41 +217,65 @@ class FileManager:
     # -------------------------
     # Initialization helpers
     # -------------------------
-    def _init_temp_counter(self) -> int:
-        existing_files = sorted(self.temp_dir.glob("*.jsonl"))
-        if not existing_files:
-            return 0
-        max_index = 0
-        for f in existing_files:
-            stem = f.stem
-            if stem.isdigit():
-                try:
-                    idx = int(stem)
-                    if idx > max_index:
-                        max_index = idx
-                except Exception:
-                    pass
-        return max_index
+    def _scan_temp_files(self) -> List[Path]:
+        """
+        Finished temp files (current and legacy suffix) in index order. The glob skips hidden
+        .tmp files and anything not named by a number; sorting by (stem length, stem) is numeric
+        order for the zero-padded names, and stays correct if an index ever outgrows six digits.
+        """
+        files = [
+            p for suffix in (TEMP_SUFFIX, LEGACY_TEMP_SUFFIX)
+            for p in self.temp_dir.glob(f"[0-9]*{suffix}")
+        ]
+        return sorted(files, key=lambda p: (len(p.stem), p.stem))
+
+    def _init_temp_counter(self, existing_files: List[Path]) -> int:
+        # existing_files comes from _scan_temp_files(), so the highest index is the last numeric name
+        for f in reversed(existing_files):
+            if f.stem.isdigit():
+                return int(f.stem)
+        return 0
+
+    @staticmethod
+    def _open_dir_fd(path: Path) -> Optional[int]:
+        try:
+            return os.open(str(path), os.O_RDONLY | os.O_DIRECTORY)
+        except (AttributeError, OSError):
+            return None
 
     # -------------------------
     # Public interface (unchanged)
     # -------------------------
     def add_entry(self, entry):
-        """Queue a Python object or dict for later write (same behavior as before)."""
+        """
+        Queue a Python object or dict for later write (same behavior as before).
+        bytes are taken as one already-serialized JSON record and written as-is.
+        """
+        t = type(entry)
+        normalize = _NORMALIZERS.get(t)
+        if normalize is None:
+            normalize = _NORMALIZERS.setdefault(t, _pick_normalizer(t))
+        entry = normalize(entry)
+
+        buffer = self._buffer
+        buffer.append(entry)
+        size = len(buffer)
+        if size < self._flush_threshold:
+            return
+        if size < self.max_buffer_size * BACKPRESSURE_FACTOR:
+            # Hand the write to the flush thread; the producer never waits on disk I/O
+            self._wake.set()
+            return
+        # Flush thread is falling behind (or backing off): write inline as backpressure.
+        # Re-check under the lock since the flush thread may have just drained the buffer.
         with self._lock:
-            if hasattr(entry, "dict"):
-                entry = entry.dict()
-            elif not isinstance(entry, dict):
-                entry = entry.__dict__
-
-            self._buffer.append(entry)
-            if len(self._buffer) >= self.max_buffer_size:
-                # flush synchronously under lock to preserve ordering
-                try:
-                    self._flush_locked()
-                except Exception as e:
-                    # Catch to avoid bubbling to caller in threaded contexts
-                    self.logger.logMessage(f"[FileManager] Error during add_entry flush: {e}")
+            if len(buffer) < self.max_buffer_size * BACKPRESSURE_FACTOR:
+                return
+            try:
+                self._flush_locked()
+            except Exception as e:
+                # Catch to avoid bubbling to caller in threaded contexts
+                self.logger.logMessage(f"[FileManager] Error during add_entry flush: {e}")
 
     def close(self):
         """Flush remaining buffer and stop background thread."""
@@ -143,6 +283,7 @@ class FileManager:
             if self._stop_event.is_set():
                 return
             self._stop_event.set()
+        self._wake.set()
 
         self.logger.logMessage(f"[FileManager] Closing {self.filepath}...")
         # Attempt a final flush (best-effort)
@@ -154,21 +295,43 @@ class FileManager:
 
         # Wait for background thread to exit cleanly
         self._thread.join(timeout=5)
+
+        # Let queued uploads finish; bundles are already on disk either way
+        self._send_executor.shutdown(wait=True)
+
+        # One barrier for every temp-file rename made during the run (best-effort)
+        try:
+            self._fsync_temp_dir()
+        except Exception:
+            self.logger.logMessage("[FileManager] fsync on temp_dir failed (non-fatal).")
+
+        # Only release the directory fd once the flush thread is gone: a thread that outlived
+        # the join could still fsync it after it was closed (or reused by another open)
+        if self._thread.is_alive():
+            self.logger.logMessage("[FileManager] Flush thread still running; leaving temp_dir fd open.")
+        else:
+            with self._lock:
+                dir_fd, self._temp_dir_fd = self._temp_dir_fd, None
+            if dir_fd is not None:
+                try:
+                    os.close(dir_fd)
+                except OSError:
+                    pass
         self.logger.logMessage(f"[FileManager] Closed cleanly.")
 
     def combine_temp_files(self):
         """
-        Combine *all* temp jsonl files into one JSON array and send it (non-blocking).
+        Combine *all* temp files into one JSON array and send it (non-blocking).
         Deletes the temp files only after they are read.
         """
-        with self._lock:
-            temp_files = sorted(self.temp_dir.glob("*.jsonl"))
+        temp_files = self._take_pending()
         if not temp_files:
             return
         combined_path = self._combine_files(temp_files, delete=True)
+        self._return_pending(temp_files)
         if combined_path:
             # send in background to avoid blocking
-            threading.Thread(target=self._send_background, args=(combined_path,), daemon=True).start()
+            self._queue_send(combined_path)
             self.logger.logMessage(f"[FileManager] Combined and queued send of {combined_path}")
 
     def combine_and_rotate(self, bundle_limit: int = 100):
@@ -176,120 +339,202 @@ class FileManager:
         Combine up to `bundle_limit` temp files into a bundle and upload.
         This does not block ongoing writes.
         """
-        # pick a slice under lock
-        with self._lock:
-            temp_files = sorted(self.temp_dir.glob("*.jsonl"))
-            if not temp_files:
-                return
-            bundle_files = temp_files[:bundle_limit]
+        # Taken from the in-memory index: no directory scan, and never the writer lock
+        bundle_files = self._take_pending(bundle_limit)
+        if not bundle_files:
+            return
 
         combined_path = self._combine_files(bundle_files, delete=True)
+        self._return_pending(bundle_files)
         if combined_path:
-            threading.Thread(target=self._send_background, args=(combined_path,), daemon=True).start()
+            self._queue_send(combined_path)
             self.logger.logMessage(f"[FileManager] Created bundle: {combined_path}")
 
     # -------------------------
     # Internal helpers
+    # -------------------------
+    def _take_pending(self, limit: Optional[int] = None) -> List[Path]:
+        """Remove and return the oldest `limit` (default: all) finished temp files from the index."""
+        with self._pending_lock:
+            pending = self._pending
+            n = len(pending) if limit is None else min(limit, len(pending))
+            return [pending.popleft() for _ in range(n)]
+
+    def _return_pending(self, files: List[Path]):
+        """Put back taken files that are still on disk (unreadable, or the bundle failed), oldest first."""
+        leftovers = [f for f in files if f.exists()]
+        if leftovers:
+            with self._pending_lock:
+                self._pending.extendleft(reversed(leftovers))
+
     # -------------------------
     def _flush_loop(self):
         while not self._stop_event.is_set():
-            try:
-                with self._lock:
-                    self._flush_locked()
-            except Exception as e:
-                self.logger.logMessage(f"[FileManager] Background flush error: {e}")
-            # Wait interruptible
-            self._stop_event.wait(self.flush_interval)
+            # Flush when the time budget is spent or the adaptive size target is met
+            buffered = len(self._buffer)
+            due = time.monotonic() - self._last_flush_ts >= self.flush_interval
+            if buffered >= self._flush_threshold or (due and buffered):
+                try:
+                    with self._lock:
+                        self._flush_locked()
+                except Exception as e:
+                    self.logger.logMessage(f"[FileManager] Background flush error: {e}")
+            elif due:
+                self._last_flush_ts = time.monotonic()
+            # Wait interruptible: producers and close() set _wake
+            self._wake.wait(self._next_flush_wait())
+            self._wake.clear()
+
+    def _next_flush_wait(self) -> float:
+        """Seconds until the time budget runs out or, at the current arrival rate, the size target is hit."""
+        wait = self.flush_interval - (time.monotonic() - self._last_flush_ts)
+        rate = self._ema_entries_per_sec
+        if rate > 0:
+            wait = min(wait, (self._flush_threshold - len(self._buffer)) / rate)
+        return max(wait, MIN_FLUSH_WAIT)
+
+    def _record_flush(self, count: int, nbytes: int):
+        """Fold one successful flush into the averages and recompute the entry threshold."""
+        now = time.monotonic()
+        elapsed = now - self._last_flush_ts
+        self._last_flush_ts = now
+        a = FLUSH_EMA_ALPHA
+        bpe = nbytes / count
+        self._ema_bytes_per_entry = bpe if not self._ema_bytes_per_entry else a * bpe + (1 - a) * self._ema_bytes_per_entry
+        if elapsed > 0:
+            rate = count / elapsed
+            self._ema_entries_per_sec = rate if not self._ema_entries_per_sec else a * rate + (1 - a) * self._ema_entries_per_sec
+        target = int(self.target_flush_bytes // max(1.0, self._ema_bytes_per_entry))
+        self._flush_threshold = max(1, min(self.max_buffer_size, target))
+
+    def _check_space(self, refresh: bool = False) -> tuple[bool, int]:
+        """
+        (ok, free_bytes) against low_space_bytes from a cached disk_usage() sample, re-sampled
+        at most every DISK_SAMPLE_INTERVAL seconds; in between, flushes subtract what they write.
+        """
+        now = time.monotonic()
+        if refresh or now - self._free_sampled_at >= DISK_SAMPLE_INTERVAL:
+            _, self._free_bytes = _has_free_space(self.filepath.parent, self.low_space_bytes)
+            self._free_sampled_at = now
+        free = self._free_bytes
+        return free >= self.low_space_bytes, free
 
     def _flush_locked(self):
         """
-        Flush the in-memory buffer into a new numbered .jsonl file (atomic).
+        Flush the in-memory buffer into a new numbered temp record file (atomic).
         This method is called while holding self._lock.
+        Steady state (plenty of disk, write succeeds) is the fast path: drain, write, done.
+        Low space, ENOSPC and other write errors go through _slow_flush.
         """
         if not self._buffer:
             return
 
-        # Snapshot buffer and clear it so producers don't block
-        entries = self._buffer
-        self._buffer = []
+        # Drain what is buffered now; producers keep appending to the right meanwhile
+        popleft = self._buffer.popleft
+        entries = [popleft() for _ in range(len(self._buffer))]
 
+        if self._check_space()[1] < self.low_space_bytes * FAST_FLUSH_HEADROOM:
+            self._slow_flush(entries)
+            return
+        try:
+            self._commit_entries(entries)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                # Disk filled faster than the cached sample knew: re-sample and take the careful path
+                self._check_space(refresh=True)
+                self._slow_flush(entries)
+            else:
+                self._write_failed(entries, e)
+        except Exception as e:
+            self._write_failed(entries, e)
+
+    def _slow_flush(self, entries: List[Union[dict, bytes]]):
+        """Flush with low-space handling: emergency cleanup first, back off if still short."""
         # Safety: if disk critically low try cleanup & re-check
-        ok, free = _has_free_space(self.filepath.parent, self.low_space_bytes)
+        ok, free = self._check_space()
         if not ok:
             self.logger.logMessage(f"[FileManager] Low disk space ({free/1024/1024:.1f} MB). Attempting emergency cleanup.")
             # Attempt to free space; if still low, buffer entries back and backoff
             self._emergency_cleanup()
-            ok2, free2 = _has_free_space(self.filepath.parent, self.low_space_bytes)
+            ok2, free2 = self._check_space()
             if not ok2:
                 # Return entries to buffer (put them in front to preserve ordering)
-                with self._lock:
-                    self._buffer = entries + self._buffer
+                self._requeue(entries)
                 self.logger.logMessage(f"[FileManager] Still low on disk after cleanup ({free2/1024/1024:.1f} MB). Backing off {self.backoff_seconds}s.")
                 time.sleep(self.backoff_seconds)
                 return
 
         # Attempt to write atomically
         try:
-            self._write_temp_file_atomic(entries)
-        except OSError as e:
+            self._commit_entries(entries)
+        except Exception as e:
+            self._write_failed(entries, e)
+
+    def _commit_entries(self, entries: List[Union[dict, bytes]]):
+        nbytes = self._write_temp_file_atomic(entries)
+        self._free_bytes -= nbytes
+        self._record_flush(len(entries), nbytes)
+
+    def _write_failed(self, entries: List[Union[dict, bytes]], e: Exception):
+        if isinstance(e, OSError):
             self.logger.logMessage(f"[FileManager] OSError during write: {e}. Returning entries to buffer and sleeping.")
             # Return entries to buffer so data isn't lost
-            with self._lock:
-                self._buffer = entries + self._buffer
+            self._requeue(entries)
             time.sleep(self.backoff_seconds)
-        except Exception as e:
+        else:
             # On unexpected errors we also return entries to buffer and continue
             self.logger.logMessage(f"[FileManager] Unexpected error writing temp file: {e}")
-            with self._lock:
-                self._buffer = entries + self._buffer
+            self._requeue(entries)
+
+    def _requeue(self, entries: List[Union[dict, bytes]]):
+        """Put unwritten entries back at the front, ahead of anything appended since the drain."""
+        self._buffer.extendleft(reversed(entries))
 
-    def _write_temp_file_atomic(self, entries: Iterable[dict]):
+    def _write_temp_file_atomic(self, entries: Iterable[Union[dict, bytes]]):
         """
-        Create a numbered temp file atomically:
-          1) Write to a .tmp file in temp_dir
-          2) fsync the file
-          3) os.replace to final .jsonl name (atomic)
-          4) fsync directory (best-effort)
+        Create a numbered temp file atomically: write a hidden .tmp file in temp_dir and
+        os.replace it to the final name, so the file appears complete or not at all.
+        Returns the number of bytes written.
+
+        Durability: temp files are intermediate, so the file is not fsync'd per flush (Linux
+        gets an asynchronous sync_file_range writeback hint instead) and temp_dir is fsync'd
+        at most once per DIR_FSYNC_EVERY files / DIR_FSYNC_INTERVAL seconds; readers still
+        never see a partial file. A power loss can drop the most recent temp files, the same
+        exposure the entries already had while buffered in memory. Bundles (_combine_files)
+        are the durable artifact and keep their fsyncs; close() syncs temp_dir once.
         """
         # increment counter under lock to avoid collisions across threads
         self._temp_file_counter += 1
         index = self._temp_file_counter
-        final_path = self.temp_dir / f"{index:06d}.jsonl"
-        tmp_path = self.temp_dir / f".{index:06d}.jsonl.tmp"
+        final_path = self.temp_dir / f"{index:06d}{TEMP_SUFFIX}"
+        tmp_path = self.temp_dir / f".{index:06d}{TEMP_SUFFIX}.tmp"
 
-        # Serialize & write
-        try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                for entry in entries:
-                    # Pydantic models handled if .json exists, otherwise default=str safe for datetimes
-                    if hasattr(entry, "json"):
-                        f.write(entry.json(separators=(",", ":")) + "\n")
-                    else:
-                        f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
-                f.flush()
-                try:
-                    os.fsync(f.fileno())
-                except Exception:
-                    # fsync can be expensive, but we attempt; if it fails keep going (best-effort)
-                    self.logger.logMessage("[FileManager] fsync failed on temp file (non-fatal).")
+        # One payload, one write: records are serialized by json_utils (orjson when installed)
+        payload = json_utils.dumps_lines(entries, TEMP_RECORD_TERMINATOR)
 
-            # Atomic move to final name
-            os.replace(str(tmp_path), str(final_path))
+        self._write_via_rename(payload, tmp_path, final_path)
+        self._pending.append(final_path)
+        self._maybe_fsync_temp_dir()
 
-            # Best-effort: fsync directory so rename is durable (may require root on some FS)
-            try:
-                dirfd = os.open(str(self.temp_dir), os.O_DIRECTORY)
-                try:
-                    os.fsync(dirfd)
-                finally:
-                    os.close(dirfd)
-            except Exception:
-                # Non-fatal; log and continue
-                self.logger.logMessage("[FileManager] fsync on temp_dir failed (non-fatal).")
+        self.logger.logMessage(f"[FileManager] Wrote temp file {final_path.name} ({len(payload)/1024:.1f} KB)")
+        return len(payload)
 
-            self.logger.logMessage(f"[FileManager] Wrote temp file {final_path.name} ({final_path.stat().st_size/1024:.1f} KB)")
+    def _write_via_rename(self, payload: bytes, tmp_path: Path, final_path: Path):
+        """Write a hidden .tmp file, then os.replace it to the final name."""
+        try:
+            # Raw fd I/O: no buffered file object, so the flush is exactly open/write/close
+            fd = os.open(str(tmp_path), _TEMP_OPEN_FLAGS, 0o644)
+            try:
+                _write_all(fd, payload)
+                # Non-blocking writeback hint: the data heads to disk now instead of at the next
+                # dirty-page flush, so the bundle's fsync later has little left to wait for
+                _async_writeback(fd)
+            finally:
+                os.close(fd)
 
-        except Exception as e:
+            # Atomic move to final name
+            os.replace(str(tmp_path), str(final_path))
+        except Exception:
             # Clean up tmp file if it exists and re-raise so caller handles buffering/backoff
             try:
                 if tmp_path.exists():
@@ -298,64 +543,115 @@ class FileManager:
                 pass
             raise
 
+    def _maybe_fsync_temp_dir(self):
+        """Amortized directory barrier: one fsync covers every temp file named since the last."""
+        self._dir_dirty += 1
+        now = time.monotonic()
+        if self._dir_dirty < DIR_FSYNC_EVERY and now - self._last_dir_fsync < DIR_FSYNC_INTERVAL:
+            return
+        self._dir_dirty = 0
+        self._last_dir_fsync = now
+        try:
+            self._fsync_temp_dir()
+        except Exception:
+            # Non-fatal; log and continue
+            self.logger.logMessage("[FileManager] fsync on temp_dir failed (non-fatal).")
+
+    def _fsync_temp_dir(self):
+        """fsync temp_dir through the cached fd; falls back to a one-off open (e.g. after close())."""
+        dir_fd = self._temp_dir_fd
+        if dir_fd is not None:
+            os.fsync(dir_fd)
+            return
+        dirfd = os.open(str(self.temp_dir), os.O_DIRECTORY)
+        try:
+            os.fsync(dirfd)
+        finally:
+            os.close(dirfd)
+
     def _combine_files(self, file_list: List[Path], delete: bool = False) -> Optional[Path]:
         """
-        Combine multiple .jsonl files into a single JSON bundle.
-        This reads files sequentially and thus can be memory intensive for very large bundles.
+        Combine multiple temp record files into a single JSON bundle.
+        Files already in the ",\n" format are appended whole with copy_file_range
+        (_copy_temp_file); those bytes are not inspected, since this class wrote them and they
+        only appear via atomic rename. Anything else (legacy JSONL temp files, or when the copy
+        is unsupported) is streamed line by line as raw bytes (no decode/re-encode), where a
+        cheap first-byte check skips lines that are not a JSON object/array.
         The function writes the bundle atomically and returns the bundle path.
+        Source files are deleted (when requested) only after the bundle is in place.
         """
         if not file_list:
             return None
 
-        all_entries = []
-        for temp_file in file_list:
-            # Defensive read: a file may get removed by another process; skip on error
-            try:
-                with open(temp_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if not line.strip():
-                            continue
-                        try:
-                            all_entries.append(json.loads(line))
-                        except Exception:
-                            # If a single line fails to parse, log and continue
-                            self.logger.logMessage(f"[FileManager] Skipping invalid JSON line in {temp_file}")
-                            continue
-                if delete:
-                    try:
-                        temp_file.unlink()
-                    except Exception as e:
-                        self.logger.logMessage(f"[FileManager] Could not delete temp file {temp_file}: {e}")
-            except Exception as e:
-                self.logger.logMessage(f"[FileManager] Error reading {temp_file}: {e}")
-
-        if not all_entries:
-            return None
-
         timestamp = _safe_iso_timestamp()
         bundle_name = f"{self.filepath.stem}_bundle_{timestamp}.json"
         bundle_tmp = self.filepath.parent / f".{bundle_name}.tmp"
         bundle_final = self.filepath.parent / bundle_name
 
         # Before writing bundle, check disk
-        ok, free = _has_free_space(self.filepath.parent, self.low_space_bytes)
+        ok, free = self._check_space()
         if not ok:
             self.logger.logMessage(f"[FileManager] Low disk space before creating bundle ({free/1024/1024:.1f} MB). Attempting emergency cleanup.")
             self._emergency_cleanup()
-            ok2, free2 = _has_free_space(self.filepath.parent, self.low_space_bytes)
+            ok2, free2 = self._check_space()
             if not ok2:
                 self.logger.logMessage(f"[FileManager] Still low on disk ({free2/1024/1024:.1f} MB). Aborting bundle creation.")
                 return None
 
         # Write bundle atomically
+        consumed = []
+        count = 0  # records taken via the line path; whole-file copies only set copied
+        copied = False
         try:
-            with open(bundle_tmp, "w", encoding="utf-8") as f:
-                json.dump(all_entries, f, indent=2, default=str)
-                f.flush()
-                try:
-                    os.fsync(f.fileno())
-                except Exception:
-                    self.logger.logMessage("[FileManager] fsync failed on bundle tmp (non-fatal).")
+            with open(bundle_tmp, "wb", buffering=0) as out:
+                # Unbuffered: the copy path writes through the fd, so all output goes through it too
+                out_fd = out.fileno()
+                pending = bytearray(b"[")
+                for temp_file in file_list:
+                    # Defensive read: a file may get removed by another process; skip on error
+                    try:
+                        with open(temp_file, "rb", buffering=BUNDLE_IO_BUFFER) as src:
+                            if self._copy_temp_file(src.fileno(), out_fd, pending):
+                                copied = True
+                                consumed.append(temp_file)
+                                continue
+                            for line in src:
+                                line = line.strip()
+                                if line.endswith(b","):
+                                    line = line[:-1].rstrip()
+                                if not line:
+                                    continue
+                                if line[:1] not in (b"{", b"["):
+                                    self.logger.logMessage(f"[FileManager] Skipping invalid JSON line in {temp_file}")
+                                    continue
+                                pending += line
+                                pending += TEMP_RECORD_TERMINATOR
+                                count += 1
+                                if len(pending) >= BUNDLE_IO_BUFFER:
+                                    _write_all(out_fd, pending)
+                                    pending.clear()
+                        consumed.append(temp_file)
+                    except FileNotFoundError:
+                        self.logger.logMessage(f"[FileManager] Temp file vanished before bundling: {temp_file}")
+                    except OSError as e:
+                        if e.errno == errno.ENOSPC:
+                            raise
+                        self.logger.logMessage(f"[FileManager] Error reading {temp_file}: {e}")
+                _write_all(out_fd, pending)
+                if count or copied:
+                    # Every element ends in ",\n"; turn the final one into "\n]" in place
+                    os.lseek(out_fd, -len(TEMP_RECORD_TERMINATOR), os.SEEK_CUR)
+                    _write_all(out_fd, b"\n]")
+                    try:
+                        os.fsync(out_fd)
+                    except Exception:
+                        self.logger.logMessage("[FileManager] fsync failed on bundle tmp (non-fatal).")
+
+            if not (count or copied):
+                bundle_tmp.unlink()
+                self._delete_temp_files(consumed, delete)
+                return None
+
             os.replace(bundle_tmp, bundle_final)
             # fsync dir (best-effort)
             try:
@@ -367,6 +663,7 @@ class FileManager:
             except Exception:
                 self.logger.logMessage("[FileManager] fsync on bundle dir failed (non-fatal).")
 
+            self._delete_temp_files(consumed, delete)
             self.logger.logMessage(f"[FileManager] Created bundle {bundle_final.name} ({bundle_final.stat().st_size/1024:.1f} KB)")
             return bundle_final
         except Exception as e:
@@ -378,6 +675,56 @@ class FileManager:
             self.logger.logMessage(f"[FileManager] Failed to write bundle {bundle_final}: {e}")
             return None
 
+    def _copy_temp_file(self, src_fd: int, out_fd: int, pending: bytearray) -> bool:
+        """
+        Append a whole temp file to the bundle with copy_file_range (no user-space copy).
+        Only files already in the ",\n" element format qualify. The contents are copied as-is,
+        without the line path's first-byte validation. Returns False, with the bundle
+        unchanged past `pending`, when the caller should fall back to the line-by-line path.
+        """
+        if _copy_file_range is None or not self._copy_file_range_ok:
+            return False
+        size = os.fstat(src_fd).st_size
+        term = TEMP_RECORD_TERMINATOR
+        if size < len(term) or os.pread(src_fd, len(term), size - len(term)) != term:
+            return False
+        _write_all(out_fd, pending)
+        pending.clear()
+        start = os.lseek(out_fd, 0, os.SEEK_CUR)
+        done = 0
+        try:
+            while done < size:
+                n = _copy_file_range(src_fd, out_fd, size - done, offset_src=done)
+                if n == 0:
+                    raise OSError(errno.EIO, "short copy_file_range")
+                done += n
+            return True
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+            if e.errno in (errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP, errno.EINVAL):
+                # Not supported here (old kernel, cross-device, FS without support): stop trying
+                self._copy_file_range_ok = False
+            os.ftruncate(out_fd, start)
+            os.lseek(out_fd, start, os.SEEK_SET)
+            return False
+
+    def _delete_temp_files(self, files: List[Path], delete: bool):
+        if not delete:
+            return
+        for temp_file in files:
+            try:
+                temp_file.unlink()
+            except Exception as e:
+                self.logger.logMessage(f"[FileManager] Could not delete temp file {temp_file}: {e}")
+
+    def _queue_send(self, bundle_path: Path):
+        try:
+            self._send_executor.submit(self._send_background, bundle_path)
+        except RuntimeError:
+            # Executor already shut down (combine after close()): keep the old one-off thread
+            threading.Thread(target=self._send_background, args=(bundle_path,), daemon=True).start()
+
     def _send_background(self, bundle_path: Path):
         """Send the given bundle using try_send() — run in a thread so uploads don't block."""
         try:
@@ -393,8 +740,10 @@ class FileManager:
         """
         Attempt to free disk space aggressively:
           1) remove oldest bundle files in the parent directory
-          2) remove oldest temp jsonl files
+          2) remove oldest temp record files
         Used when low/critical disk thresholds are hit.
+        Progress is tracked by adding each removed file's size to the cached free-space
+        estimate; disk_usage() is sampled once at the end to confirm.
         """
         try:
             # Step 1: remove oldest bundle files (bundle pattern: *_bundle_*.json)
@@ -406,29 +755,30 @@ class FileManager:
                     size = b.stat().st_size
                     b.unlink()
                     freed += size
+                    self._free_bytes += size
                     self.logger.logMessage(f"[FileManager] Emergency cleanup removed bundle {b.name} ({size/1024:.1f} KB)")
-                    ok, free = _has_free_space(parent, self.low_space_bytes)
-                    if ok:
-                        return
+                    if self._free_bytes >= self.low_space_bytes:
+                        break
                 except Exception as e:
                     self.logger.logMessage(f"[FileManager] Could not remove bundle {b}: {e}")
 
-            # Step 2: remove oldest temp files
-            temp_files = sorted(self.temp_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
-            for t in temp_files:
+            # Step 2: remove oldest temp files (front of the pending index)
+            while self._free_bytes < self.low_space_bytes:
+                taken = self._take_pending(1)
+                if not taken:
+                    break
+                t = taken[0]
                 try:
                     size = t.stat().st_size
                     t.unlink()
                     freed += size
+                    self._free_bytes += size
                     self.logger.logMessage(f"[FileManager] Emergency cleanup removed temp {t.name} ({size/1024:.1f} KB)")
-                    ok, free = _has_free_space(parent, self.low_space_bytes)
-                    if ok:
-                        return
                 except Exception as e:
                     self.logger.logMessage(f"[FileManager] Could not remove temp {t}: {e}")
 
-            # If still not enough, log a critical message
-            ok_final, free_final = _has_free_space(parent, self.low_space_bytes)
+            # Confirm the running estimate with one real sample
+            ok_final, free_final = self._check_space(refresh=True)
             self.logger.logMessage(f"[FileManager] Emergency cleanup finished; freed ~{freed/1024:.1f} KB. Free={free_final/1024/1024:.1f} MB (ok={ok_final})")
         except Exception as e:
             self.logger.logMessage(f"[FileManager] Emergency cleanup failed: {e}")
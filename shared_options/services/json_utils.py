@@ -0,0 +1,56 @@
+# json_utils.py
+"""
+JSON encode/decode helpers with an optional orjson fast path.
+
+dumps() always returns compact UTF-8 bytes and loads() accepts bytes or str,
+so callers behave the same whether or not orjson is installed.
+dumps_lines() builds a whole JSONL payload in one pass for batched writers.
+"""
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # optional: pip install shared_options[fast]
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj):
+    # Same fallback as the old json.dumps(default=str), but keep ISO datetimes
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+if HAS_ORJSON:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+    loads = json.loads
+
+
+# Exact-type set lookup: much cheaper per record than isinstance() against a tuple
+_RAW_TYPES = frozenset((bytes, bytearray))
+
+
+def dumps_lines(records, terminator: bytes = b"\n") -> bytes:
+    """
+    One payload for many records, each followed by terminator (JSONL by default).
+    bytes/bytearray records are taken as already-serialized JSON and passed through.
+    """
+    _dumps = dumps
+    raw = _RAW_TYPES
+    parts = [r if r.__class__ in raw else _dumps(r) for r in records]
+    if not parts:
+        return b""
+    parts.append(b"")
+    return terminator.join(parts)
@@ -1,12 +1,19 @@
 # services/core/shutdown_handler.py
 import threading
-from typing import Callable, List
+import time
+from typing import Callable, List, Tuple
+
+# Overall budget for stop_all(): callbacks run concurrently, so this bounds the slowest one
+SHUTDOWN_TIMEOUT = 10.0
+# Minimum time left for the run-last callbacks (e.g. the logger) even if the others used the whole budget
+LAST_CALLBACK_GRACE = 2.0
 
 class ShutdownManager:
     _stop_event: threading.Event = None
     _error_logger: Callable = None
     _initialized: bool = False
-    _callbacks: List[Callable[[str], None]] = []
+    _callbacks: List[Tuple[str, Callable[[str], None]]] = []
+    _last_callbacks: List[Tuple[str, Callable[[str], None]]] = []
 
     @classmethod
     def init(cls, error_logger=None, stop_event=None):
@@ -17,38 +24,64 @@ class ShutdownManager:
         cls._stop_event = stop_event or threading.Event()
         cls._error_logger = error_logger
         cls._callbacks = []
+        cls._last_callbacks = []
         cls._initialized = True
         cls.log(f"[ShutdownManager] Initialized. Stop event set: {cls._stop_event.is_set()}")
 
     @classmethod
-    def register(cls,name:str, callback: Callable[[str], None]):
+    def register(cls,name:str, callback: Callable[[str], None], last: bool = False):
         """
         Register a callback to be called when stop_all() is triggered.
         Callback must accept a single string argument: reason
+        last=True defers it until every other callback has finished (used by the logger, which the others log through).
         """
         if not callable(callback):
             raise ValueError("callback must be callable")
-        cls._callbacks.append(callback)
+        (cls._last_callbacks if last else cls._callbacks).append((name, callback))
         cls.log(f"[ShutdownManager] Callback registered: {name}")
 
     @classmethod
-    def stop_all(cls, reason="Manual shutdown"):
+    def stop_all(cls, reason="Manual shutdown", timeout=SHUTDOWN_TIMEOUT):
         if cls._stop_event:
             cls._stop_event.set()
         cls.log(f"[ShutdownManager] stop_all triggered: {reason}")
 
-        # Execute registered callbacks
-        for cb in cls._callbacks:
-            try:
-                cb(reason)
-            except Exception as e:
-                cls.log(f"[ShutdownManager] Callback error: {e}")
+        # Execute registered callbacks concurrently: shutdown takes as long as the slowest
+        # callback (each FileManager flushes and joins its thread) rather than the sum.
+        # Daemon threads + a join deadline: a hung callback is abandoned and cannot hold up interpreter exit.
+        deadline = time.monotonic() + timeout
+        cls._run_callbacks(list(cls._callbacks), reason, deadline)
+        # Then the run-last callbacks (the logger), once nothing else is still logging through them
+        deadline = max(deadline, time.monotonic() + LAST_CALLBACK_GRACE)
+        cls._run_callbacks(list(cls._last_callbacks), reason, deadline)
+
+    @classmethod
+    def _run_callbacks(cls, callbacks, reason, deadline):
+        if not callbacks:
+            return
+        threads = []
+        for name, cb in callbacks:
+            t = threading.Thread(target=cls._invoke, args=(name, cb, reason), name=f"shutdown-{name}", daemon=True)
+            t.start()
+            threads.append((name, t))
+        for name, t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+            if t.is_alive():
+                cls.log(f"[ShutdownManager] Callback still running at the shutdown deadline, abandoning it: {name}")
+
+    @classmethod
+    def _invoke(cls, name, cb, reason):
+        try:
+            cb(reason)
+        except Exception as e:
+            cls.log(f"[ShutdownManager] Callback error ({name}): {e}")
 
     @classmethod
     def reset(cls):
         cls._stop_event = None
         cls._error_logger = None
         cls._callbacks = []
+        cls._last_callbacks = []
         cls._initialized = False
         cls.log("[ShutdownManager] Reset complete.")
 
@@ -1,54 +1,128 @@
 # services/core/token_status.py
-import json
+import mmap
 import os
+import struct
 import time
-from threading import Lock
+from threading import Event, Lock
 from shared_options.log.logger_singleton import getLogger  # assuming you already use logger
 
+# Fixed binary record shared by every process through a memory map:
+#   magic (4 bytes) | version (u32)
+#   | valid (u8) | 7 pad bytes | last_checked (u64 epoch) | last_validated (u64 epoch)
+#   | alert_created_at (u64 epoch) | alert_stage (u8) | 7 pad bytes
+# alert_* remember which token (by created_at) the last expiry alert went out for, and at which stage.
+# A file with another size or header (e.g. the old JSON status file) is re-initialized, never parsed.
+# Reads are a load from the mapped page: no open/read/parse/close per check.
+_HEADER = struct.Struct("<4sI")
+_MAGIC = b"TKST"
+_VERSION = 1
+_HEADER_BYTES = _HEADER.pack(_MAGIC, _VERSION)
+_STATUS = struct.Struct("<B7xQQ")
+_STATUS_OFFSET = _HEADER.size
+_ALERT = struct.Struct("<QB7x")
+_ALERT_OFFSET = _STATUS_OFFSET + _STATUS.size
+_RECORD_SIZE = _ALERT_OFFSET + _ALERT.size
+_VALID_OFFSET = _STATUS_OFFSET
+
+# One event per status file, shared by every TokenStatus in this process: set_status(True)
+# wakes all waiters at once; other processes' updates are picked up by the wait timeout
+_VALID_EVENTS = {}
+_VALID_EVENTS_LOCK = Lock()
+
+
+def _valid_event_for(filepath) -> Event:
+    key = os.path.realpath(filepath)
+    with _VALID_EVENTS_LOCK:
+        event = _VALID_EVENTS.get(key)
+        if event is None:
+            event = _VALID_EVENTS[key] = Event()
+        return event
+
+
 class TokenStatus:
-    def __init__(self, filepath="encryption/token_status.json"):
+    def __init__(self, filepath="encryption/token_status.bin"):
         self.filepath = filepath
-        self.lock = Lock()
-        self._ensure_file_exists()
+        self.lock = Lock()  # serializes writers in this process; readers don't take it
+        self._mm = None
+        self._valid_event = _valid_event_for(filepath)
         self.logger = getLogger()
+        self._ensure_file_exists()
 
     def _ensure_file_exists(self):
-        """Create the file if missing or corrupted."""
-        if not os.path.exists(self.filepath):
-            self.set_status(valid=True)  # assume valid at startup
-        else:
-            try:
-                with open(self.filepath, "r") as f:
-                    json.load(f)  # just try to parse
-            except Exception:
-                # corrupted file, overwrite clean
-                self.set_status(valid=True)
-
-    def set_status(self, valid: bool):
-        """Set current token validity flag."""
+        """
+        Create (or repair) the status file and map it. A new file, or one that is not a record of
+        this version (wrong size or header), is reset and starts as assumed-valid.
+        """
+        fd = os.open(self.filepath, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            fresh = size != _RECORD_SIZE
+            if fresh:
+                os.ftruncate(fd, 0)  # drop any old contents so the record starts zeroed
+                os.ftruncate(fd, _RECORD_SIZE)
+            self._mm = mmap.mmap(fd, _RECORD_SIZE)
+        finally:
+            os.close(fd)  # the mapping keeps its own reference
+        if not fresh and self._mm[:_HEADER.size] != _HEADER_BYTES:
+            fresh = True
+            self._mm[:] = bytes(_RECORD_SIZE)
+        if fresh:
+            if size:
+                self.logger.logMessage(f"[TokenStatus] {self.filepath} is not a v{_VERSION} status record; re-initializing")
+            self._mm[:_HEADER.size] = _HEADER_BYTES
+            self.set_status(valid=True, verified=False)  # assume valid at startup
+
+    def set_status(self, valid: bool, verified: bool = True):
+        """
+        Set current token validity flag.
+        verified=False marks an assumed status (e.g. at startup), which does not count as a recent validation.
+        """
         with self.lock:
-            data = {"valid": valid, "last_checked": int(time.time())}
-            with open(self.filepath, "w") as f:
-                json.dump(data, f)
+            now = int(time.time())
+            _STATUS.pack_into(self._mm, _STATUS_OFFSET, int(bool(valid)), now, now if valid and verified else 0)
+            self._mm.flush()
+            if valid:
+                self._valid_event.set()
+            else:
+                self._valid_event.clear()
 
     def is_valid(self) -> bool:
-        """Read token validity; auto-heal if corrupted."""
+        """Read token validity straight from the shared mapping (single-byte load, no syscalls)."""
+        return self._mm[_VALID_OFFSET] != 0
+
+    def validated_within(self, seconds: float) -> bool:
+        """True if the token was confirmed valid (not just assumed) in the last `seconds` seconds."""
+        valid, _, last_validated = _STATUS.unpack_from(self._mm, _STATUS_OFFSET)
+        # A timestamp from the future (clock step, corrupt record) proves nothing
+        return bool(valid) and 0 <= time.time() - last_validated < seconds
+
+    def claim_expiry_alert(self, created_at: int, stage: int) -> bool:
+        """
+        Record that the expiry alert for the token created at `created_at` has reached `stage`
+        (1 = expiring soon, 2 = expired). Returns True only for the first claim of each stage,
+        so every process sharing the file sends each alert once per token instead of once per start.
+        """
         with self.lock:
-            try:
-                with open(self.filepath, "r") as f:
-                    data = json.load(f)
-                    return data.get("valid", False)
-            except Exception:
-                # if corrupted, recreate as invalid
-                self.set_status(valid=False)
+            alerted_for, alerted_stage = _ALERT.unpack_from(self._mm, _ALERT_OFFSET)
+            if alerted_for == created_at and alerted_stage >= stage:
                 return False
+            _ALERT.pack_into(self._mm, _ALERT_OFFSET, created_at, stage)
+            self._mm.flush()
+            return True
 
     def wait_until_valid(self, check_interval=60):
         """
         Block until token status is valid.
         Useful for scanners that should pause until tokens are refreshed.
+        Wakes as soon as set_status(True) runs in this process; check_interval only bounds
+        how long a change made by another process can go unnoticed.
         """
+        event = self._valid_event
         while not self.is_valid():
             self.logger.logMessage("[TokenStatus] Token invalid, waiting...")
-            time.sleep(check_interval)
+            # Clear, then re-check, so a set_status(True) landing in between still wakes us
+            event.clear()
+            if self.is_valid():
+                break
+            event.wait(check_interval)
         self.logger.logMessage("[TokenStatus] Token valid, resuming work")
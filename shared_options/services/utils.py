@@ -1,39 +1,73 @@
 # utils.py
-from datetime import datetime,timedelta
+from datetime import datetime,timedelta,timezone
 from shared_options.models.OptionFeature import OptionFeature
+from shared_options.models.OptionFeatureBatch import OptionFeatureBatch
+from shared_options.constants.constants import FEATURE_COLS, FEATURE_ROW_GETTER
 from shared_options.models.option import OptionContract, OptionGreeks
-import json
 import os
 import time
 from dataclasses import is_dataclass, fields, is_dataclass
-from typing import get_type_hints, List, Union, TypeVar, Dict, Any, Type, Union
+from typing import get_type_hints, Iterable, List, Optional, Union, TypeVar, Dict, Any, Type, Union
 import tempfile
 from pathlib import Path
 import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from shared_options.log.logger_singleton import getLogger
+from shared_options.log.logger import is_interactive  # re-exported; single definition lives with the logger
+from shared_options.services.json_utils import dumps as json_dumps, loads as json_loads
 import sys
+import atexit
 import time as pyTime
 import requests
+import requests.adapters
 import pandas_market_calendars as mcal
 import pytz
 import shutil
+import mmap
+import queue
+import uuid
+import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; compute_derived_fields() falls back to NumPy
+    njit = None
 
-def extract_features_from_snapshot(snapshot: Dict) -> OptionFeature:
-    """Convert raw snapshot JSON to OptionFeature dataclass."""
+
+# Snapshot keys copied straight into numeric columns (top level / under "greeks")
+_SNAPSHOT_NUMERIC_COLS = (
+    "strikePrice", "lastPrice", "bid", "ask", "bidSize", "askSize", "volume", "openInterest", "nearPrice",
+)
+_SNAPSHOT_GREEK_COLS = ("delta", "gamma", "theta", "vega", "rho", "iv")
+
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:  # ciso8601 is optional (shared_options[fast]); stdlib parser otherwise
+    _parse_iso = datetime.fromisoformat
+
+# A chain repeats the same expiry (and capture timestamp) across every strike: parse each string once
+@lru_cache(maxsize=65536)
+def _parse_iso_cached(value: str) -> datetime:
+    return _parse_iso(value)
+
+def _snapshot_days_to_expiration(snapshot: Dict) -> int:
     expiry_str = snapshot.get("expiryDate")
     timestamp_str = snapshot.get("timestamp")
-
-    days_to_exp = 0
     if expiry_str and timestamp_str:
         try:
-            expiry_dt = datetime.fromisoformat(expiry_str)
-            timestamp_dt = datetime.fromisoformat(timestamp_str)
-            days_to_exp = (expiry_dt - timestamp_dt).days
+            expiry_dt = _parse_iso_cached(expiry_str)
+            timestamp_dt = _parse_iso_cached(timestamp_str)
+            return (expiry_dt - timestamp_dt).days
         except:
-            days_to_exp = 0
+            return 0
+    return 0
+
+def _snapshot_fields(snapshot: Dict) -> Dict[str, Any]:
+    """Pull the OptionFeature fields out of a raw snapshot dict."""
+    days_to_exp = _snapshot_days_to_expiration(snapshot)
 
     bid = float(snapshot.get("bid", 0))
     ask = float(snapshot.get("ask", 0))
@@ -45,7 +79,7 @@ def extract_features_from_snapshot(snapshot: Dict) -> OptionFeature:
 
     g = snapshot.get("greeks", {}) or {}
 
-    return OptionFeature(
+    return dict(
         symbol=snapshot.get("symbol", ""),
         osiKey=snapshot.get("osiKey", ""),
         optionType=1 if str(snapshot.get("optionType", "CALL")).upper() == "CALL" else 0,
@@ -71,43 +105,154 @@ def extract_features_from_snapshot(snapshot: Dict) -> OptionFeature:
         moneyness=moneyness
     )
 
-def features_to_array(feature: OptionFeature):
-    """Convert OptionFeature into a numeric array for ML models."""
-    return [
-        feature.optionType,
-        feature.strikePrice,
-        feature.lastPrice,
-        feature.bid,
-        feature.ask,
-        feature.bidSize,
-        feature.askSize,
-        feature.volume,
-        feature.openInterest,
-        feature.nearPrice,
-        feature.inTheMoney,
-        feature.delta,
-        feature.gamma,
-        feature.theta,
-        feature.vega,
-        feature.rho,
-        feature.iv,
-        feature.spread or 0,
-        feature.midPrice or 0,
-        feature.moneyness or 0,
-        feature.daysToExpiration
-    ]
-    
+def extract_features_from_snapshot(snapshot: Dict, timestamp: Optional[datetime] = None) -> OptionFeature:
+    """
+    Convert raw snapshot JSON to OptionFeature dataclass.
+    Pass `timestamp` to reuse one precomputed capture time across every record of a snapshot.
+    """
+    values = _snapshot_fields(snapshot)
+    if timestamp is not None:
+        values["timestamp"] = timestamp
+    return OptionFeature(**values)
+
+def extract_features_batch(snapshots: Iterable[Dict]) -> OptionFeatureBatch:
+    """
+    Convert many raw snapshots straight into an OptionFeatureBatch (struct-of-arrays),
+    skipping per-row OptionFeature validation.
+    Each field is pulled into one column list and converted with a single np.asarray; the
+    derived columns (spread/midPrice/moneyness) are then computed over whole arrays.
+    """
+    snapshots = snapshots if isinstance(snapshots, list) else list(snapshots)
+    greeks = [s.get("greeks") or {} for s in snapshots]
+
+    columns = {}
+    for col in _SNAPSHOT_NUMERIC_COLS:
+        columns[col] = np.asarray([s.get(col) or 0 for s in snapshots], dtype=np.float64)
+    for col in _SNAPSHOT_GREEK_COLS:
+        columns[col] = np.asarray([g.get(col) or 0 for g in greeks], dtype=np.float64)
+
+    option_types = np.asarray([str(s.get("optionType", "CALL")) for s in snapshots], dtype=str)
+    columns["optionType"] = np.char.upper(option_types) == "CALL"
+    itm = np.asarray([str(s.get("inTheMoney", "n")) for s in snapshots], dtype=str)
+    columns["inTheMoney"] = np.char.startswith(np.char.lower(itm), "y")
+    columns["daysToExpiration"] = [_snapshot_days_to_expiration(s) for s in snapshots]
+
+    batch = OptionFeatureBatch.from_columns(
+        [s.get("symbol", "") for s in snapshots],
+        [s.get("osiKey", "") for s in snapshots],
+        columns,
+    )
+    return compute_derived_fields(batch)
 
 
+# Column positions in the FEATURE_COLS matrix (compile-time constants for the numba kernel)
+_COL_BID = FEATURE_COLS.index("bid")
+_COL_ASK = FEATURE_COLS.index("ask")
+_COL_STRIKE = FEATURE_COLS.index("strikePrice")
+_COL_NEAR = FEATURE_COLS.index("nearPrice")
+_COL_SPREAD = FEATURE_COLS.index("spread")
+_COL_MID = FEATURE_COLS.index("midPrice")
+_COL_MONEYNESS = FEATURE_COLS.index("moneyness")
+_DERIVED_COLS = (_COL_SPREAD, _COL_MID, _COL_MONEYNESS)
 
-def option_contract_to_feature(opt: OptionContract) -> OptionFeature:
+def features_to_array(feature: OptionFeature):
+    """Convert OptionFeature into a numeric array for ML models."""
+    row = list(FEATURE_ROW_GETTER(feature))
+    row[_COL_SPREAD] = row[_COL_SPREAD] or 0
+    row[_COL_MID] = row[_COL_MID] or 0
+    row[_COL_MONEYNESS] = row[_COL_MONEYNESS] or 0
+    return row
+
+def features_to_array_batch(features: Iterable[OptionFeature], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Stack many features into an (N, len(FEATURE_COLS)) float64 matrix in one conversion.
+    Rows are gathered with a single attrgetter call each and handed to NumPy together, so no
+    per-row list or boxed float survives the call. Pass `out` to fill a preallocated buffer.
+    Missing derived fields are 0 (like features_to_array); other missing values become NaN.
+    """
+    rows = list(map(FEATURE_ROW_GETTER, features))
+    if out is None:
+        out = np.array(rows, dtype=np.float64).reshape(len(rows), len(FEATURE_COLS))
+    else:
+        out = out[:len(rows)]
+        out[...] = rows if rows else 0
+    for col in _DERIVED_COLS:
+        np.nan_to_num(out[:, col], copy=False, nan=0.0)
+    return out
+
+
+if njit is not None:
+    # Explicit signature => compiled at import (and cached on disk), not on first call.
+    # fastmath flags exclude nnan/ninf because missing inputs are stored as NaN.
+    @njit("float32[:,:](float32[:,:])", cache=True, parallel=True,
+          fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _derived_fields_kernel(values):
+        for i in prange(values.shape[0]):
+            bid = values[i, _COL_BID]
+            ask = values[i, _COL_ASK]
+            if bid != 0 and ask != 0:
+                values[i, _COL_SPREAD] = ask - bid
+                values[i, _COL_MID] = (ask + bid) * 0.5
+            else:
+                values[i, _COL_SPREAD] = 0
+                values[i, _COL_MID] = 0
+            near = values[i, _COL_NEAR]
+            if near != 0:
+                values[i, _COL_MONEYNESS] = (near - values[i, _COL_STRIKE]) / near
+            else:
+                values[i, _COL_MONEYNESS] = 0
+        return values
+else:
+    _derived_fields_kernel = None
+
+
+def compute_derived_fields(batch: OptionFeatureBatch) -> OptionFeatureBatch:
+    """
+    (Re)compute spread, midPrice and moneyness for every row of the batch in place.
+    Same rules as the per-record path; missing values export as 0 like features_to_array().
+    """
+    values = batch.to_numpy()
+    if _derived_fields_kernel is not None:
+        _derived_fields_kernel(values)
+        return batch
+
+    # NumPy path: ufuncs write straight into the batch's own columns (out=), no result temporaries
+    bid = values[:, _COL_BID]
+    ask = values[:, _COL_ASK]
+    near = values[:, _COL_NEAR]
+    spread = values[:, _COL_SPREAD]
+    mid = values[:, _COL_MID]
+    moneyness = values[:, _COL_MONEYNESS]
+
+    unquoted = np.equal(bid, 0)
+    np.logical_or(unquoted, np.equal(ask, 0), out=unquoted)
+    np.subtract(ask, bid, out=spread)
+    np.add(ask, bid, out=mid)
+    np.multiply(mid, 0.5, out=mid)
+    spread[unquoted] = 0
+    mid[unquoted] = 0
+
+    has_near = np.not_equal(near, 0)
+    np.subtract(near, values[:, _COL_STRIKE], out=moneyness)
+    np.divide(moneyness, near, out=moneyness, where=has_near)
+    moneyness[~has_near] = 0
+    return batch
+
+
+
+def option_contract_to_feature(opt: OptionContract, timestamp: Optional[datetime] = None, *,
+                               now_utc: Optional[float] = None) -> OptionFeature:
     """
     Convert an OptionContract instance into a shared OptionFeature Pydantic model.
+    Pass `timestamp` to reuse one precomputed capture time across a whole chain, and
+    `now_utc` (epoch seconds) to reuse one "now" for the days-to-expiration math.
     """
-    # Compute days to expiration
+    # Compute days to expiration on epoch seconds (naive expiries count as local time, as before)
     days_to_exp = None
     if opt.expiryDate:
-        days_to_exp = (opt.expiryDate.astimezone() - datetime.now().astimezone()).total_seconds() / 86400.0
+        if now_utc is None:
+            now_utc = time.time()
+        days_to_exp = (opt.expiryDate.timestamp() - now_utc) / 86400.0
 
     # Spread and mid price
     spread = None
@@ -124,67 +269,88 @@ def option_contract_to_feature(opt: OptionContract) -> OptionFeature:
     # Greeks
     greeks = opt.OptionGreeks or OptionGreeks()
 
+    extra = {} if timestamp is None else {"timestamp": timestamp}
+
+    # Numeric fields go in as-is: OptionFeature's float fields coerce ints/strings themselves,
+    # so only None needs mapping (to 0.0; a real 0 maps to the same value)
     feature = OptionFeature(
         symbol=opt.symbol,
         displayName=opt.displaySymbol,
         osiKey=opt.osiKey,
         optionType=1 if opt.optionType.upper() == "CALL" else 0,
-        strikePrice=float(opt.strikePrice),
-        lastPrice=float(opt.lastPrice) if opt.lastPrice is not None else 0.0,
-        bid=float(opt.bid) if opt.bid is not None else 0.0,
-        ask=float(opt.ask) if opt.ask is not None else 0.0,
-        bidSize=float(opt.bidSize) if opt.bidSize is not None else 0.0,
-        askSize=float(opt.askSize) if opt.askSize is not None else 0.0,
-        volume=float(opt.volume) if opt.volume is not None else 0.0,
-        openInterest=float(opt.openInterest) if opt.openInterest is not None else 0.0,
-        nearPrice=float(opt.nearPrice) if opt.nearPrice is not None else 0.0,
+        strikePrice=opt.strikePrice,
+        lastPrice=opt.lastPrice or 0.0,
+        bid=opt.bid or 0.0,
+        ask=opt.ask or 0.0,
+        bidSize=opt.bidSize or 0.0,
+        askSize=opt.askSize or 0.0,
+        volume=opt.volume or 0.0,
+        openInterest=opt.openInterest or 0.0,
+        nearPrice=opt.nearPrice or 0.0,
         inTheMoney=1 if (opt.inTheMoney or "").lower().startswith("y") else 0,
-        delta=float(greeks.delta) if greeks.delta is not None else 0.0,
-        gamma=float(greeks.gamma) if greeks.gamma is not None else 0.0,
-        theta=float(greeks.theta) if greeks.theta is not None else 0.0,
-        vega=float(greeks.vega) if greeks.vega is not None else 0.0,
-        rho=float(greeks.rho) if greeks.rho is not None else 0.0,
-        iv=float(greeks.iv) if greeks.iv is not None else 0.0,
-        daysToExpiration=float(days_to_exp) if days_to_exp is not None else 0.0,
+        delta=greeks.delta or 0.0,
+        gamma=greeks.gamma or 0.0,
+        theta=greeks.theta or 0.0,
+        vega=greeks.vega or 0.0,
+        rho=greeks.rho or 0.0,
+        iv=greeks.iv or 0.0,
+        daysToExpiration=days_to_exp or 0.0,
         spread=spread,
         midPrice=mid_price,
         moneyness=moneyness,
+        **extra,
         )
 
     return feature
 
-def wait_until_market_open(stop_event=None):
-    # Create NYSE calendar
-    nyse = mcal.get_calendar('NYSE')
-    eastern = pytz.timezone("America/New_York")
+def option_contracts_to_features(opts: Iterable[OptionContract], timestamp: Optional[datetime] = None) -> List[OptionFeature]:
+    """
+    Convert a whole chain with option_contract_to_feature; every feature shares one capture
+    time, which is also the "now" for days to expiration.
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    now_utc = timestamp.timestamp()
+    return [option_contract_to_feature(opt, timestamp, now_utc=now_utc) for opt in opts]
+
+# NYSE calendar and a rolling window of its sessions, built once and reused across calls:
+# schedule() assembles pandas frames, too heavy to redo every time the scanner probes the market
+_NYSE = None
+_EASTERN = pytz.timezone("America/New_York")
+SESSION_WINDOW_DAYS = 14
+_sessions_lock = threading.Lock()
+_sessions_window = (None, None)  # (first date, last date) covered by _sessions
+_sessions = ()                   # ((open, close), ...) as Eastern datetimes, in order
+
+def _nyse_sessions(start_date, end_date):
+    """NYSE sessions overlapping [start_date, end_date], served from the cached window when it covers them."""
+    global _NYSE, _sessions_window, _sessions
+    with _sessions_lock:
+        first, last = _sessions_window
+        if first is None or start_date < first or end_date > last:
+            if _NYSE is None:
+                _NYSE = mcal.get_calendar('NYSE')
+            last = max(end_date, start_date + timedelta(days=SESSION_WINDOW_DAYS))
+            schedule = _NYSE.schedule(start_date=start_date, end_date=last)
+            opens = schedule['market_open'].dt.tz_convert(_EASTERN).dt.to_pydatetime()
+            closes = schedule['market_close'].dt.tz_convert(_EASTERN).dt.to_pydatetime()
+            _sessions = tuple(zip(opens, closes))
+            _sessions_window = (start_date, last)
+        sessions = _sessions
+    return [s for s in sessions if start_date <= s[0].date() <= end_date]
 
+def wait_until_market_open(stop_event=None):
     """Waits until the next NYSE market open if currently closed."""
-    now = datetime.now(tz=eastern)
-    # Get trading schedule for today and tomorrow
-    schedule = nyse.schedule(start_date=now.date(), end_date=(now + timedelta(days=1)).date())
-
-    if schedule.empty:
-        # Market closed today (holiday or weekend)
-        next_valid_day = nyse.valid_days(start_date=now.date(), end_date=now + timedelta(days=7))[0]
-        next_open_utc = nyse.schedule(start_date=next_valid_day, end_date=next_valid_day).iloc[0]['market_open'].to_pydatetime()
-        next_open = next_open_utc.astimezone(eastern)
-    else:
-        today_open = schedule.iloc[0]['market_open'].to_pydatetime().astimezone(eastern)
-        today_close = schedule.iloc[0]['market_close'].to_pydatetime().astimezone(eastern)
-
-        if now < today_open:
-            next_open = today_open
-        elif now > today_close:
-            # After close — find next open day
-            now = datetime.now(tz=eastern)
-            start_date = (now + timedelta(days=1)).date()
-            end_date = (now + timedelta(days=7)).date()
-            next_valid_day = nyse.valid_days(start_date=start_date, end_date=end_date)[0]
-            next_open_utc = nyse.schedule(start_date=next_valid_day, end_date=next_valid_day).iloc[0]['market_open'].to_pydatetime()
-            next_open = next_open_utc.astimezone(eastern)
-        else:
+    now = datetime.now(tz=_EASTERN)
+    next_open = None
+    for market_open, market_close in _nyse_sessions(now.date(), (now + timedelta(days=7)).date()):
+        if now < market_open:
+            next_open = market_open
+            break
+        if now <= market_close:
             return True
-
+    if next_open is None:
+        raise RuntimeError("[Market Hours] No NYSE session found in the next 7 days")
 
     # Calculate wait time
     wait_seconds = (next_open - now).total_seconds()
@@ -199,18 +365,19 @@ def wait_until_market_open(stop_event=None):
 
 
 def load_json_cache(file_path, max_age_seconds=86400):
-    if not os.path.exists(file_path):
+    try:
+        stat = os.stat(file_path)  # one stat answers both "exists?" and "how old?"
+    except FileNotFoundError:
         return None
-    stat = os.stat(file_path)
     if time.time() - stat.st_mtime > max_age_seconds:
         return None
-    with open(file_path, "r") as f:
-        return json.load(f)
+    with open(file_path, "rb") as f:
+        return json_loads(f.read())
 
 def save_json_cache(file_path, data):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w") as f:
-        json.dump(data, f)
+    with open(file_path, "wb") as f:
+        f.write(json_dumps(data))
 
 def get_boolean_input(prompt_message: str,defaultValue: bool = False, defaultOnEnter:bool = True):
     while True:
@@ -243,6 +410,56 @@ def yes_no(prompt: str, defaultResponse: bool = True, defaultOnEnter:bool = True
 
 T = TypeVar("T")
 
+# from_dict field kinds
+_PRIMITIVE = "primitive"
+_OPTIONAL = "optional"
+_LIST = "list"
+_DATACLASS = "dataclass"
+
+def _classify(field_type):
+    """Return (kind, inner_type) for one resolved field annotation."""
+    origin = getattr(field_type, "__origin__", None)
+    args = getattr(field_type, "__args__", ())
+    if origin is Union and type(None) in args:
+        # Optional[T] -> unwrap the inner type
+        return _OPTIONAL, (args[0] if args[0] != type(None) else args[1])
+    if origin is list and args:
+        return _LIST, args[0]
+    if is_dataclass(field_type):
+        return _DATACLASS, field_type
+    return _PRIMITIVE, None
+
+@lru_cache(maxsize=None)
+def _field_plan(cls) -> tuple:
+    """(name, kind, inner_type) per dataclass field; get_type_hints/fields run once per class."""
+    type_hints = get_type_hints(cls)
+    return tuple((f.name, *_classify(type_hints.get(f.name, f.type))) for f in fields(cls))
+
+@lru_cache(maxsize=None)
+def _make_builder(cls):
+    """
+    Generate a constructor specialised to cls from its field plan: one straight-line
+    cls(name=..., ...) call per record instead of a generic per-field loop.
+    """
+    namespace = {"cls": cls, "_fd": from_dict}
+    lines = ["def build(data):", "    get = data.get"]
+    args = []
+    for i, (field_name, kind, inner_type) in enumerate(_field_plan(cls)):
+        lines.append(f"    v{i} = get({field_name!r})")
+        if kind is _PRIMITIVE:
+            args.append(f"{field_name}=v{i}")
+            continue
+        namespace[f"_T{i}"] = inner_type
+        if kind is _LIST:
+            conv = f"[_fd(_T{i}, x) for x in v{i}]"
+        else:
+            # Optional[T] (unwrapped) or nested dataclass
+            conv = f"_fd(_T{i}, v{i})"
+        args.append(f"{field_name}=None if v{i} is None else {conv}")
+    lines.append(f"    return cls({', '.join(args)})")
+    exec("\n".join(lines), namespace)
+    return namespace["build"]
+
 def from_dict(cls: Type[T], data: Union[Dict[str, Any], List[Any]]) -> T:
     """
     Recursively converts a dict (or list of dicts) into dataclass instances.
@@ -262,41 +479,7 @@ def from_dict(cls: Type[T], data: Union[Dict[str, Any], List[Any]]) -> T:
     if not is_dataclass(cls):
         return data
 
-    # cls is a dataclass, get type hints
-    type_hints = get_type_hints(cls)
-
-    # Build a dict of field values
-    init_values = {}
-    for f in fields(cls):
-        field_name = f.name
-        field_type = type_hints.get(field_name, f.type)
-
-        if field_name not in data or data[field_name] is None:
-            init_values[field_name] = None
-            continue
-
-        value = data[field_name]
-
-        # Handle Optional[T]
-        origin = getattr(field_type, "__origin__", None)
-        args = getattr(field_type, "__args__", ())
-
-        if origin is Union and type(None) in args:
-            # Optional[T] -> unwrap the inner type
-            inner_type = args[0] if args[0] != type(None) else args[1]
-            init_values[field_name] = from_dict(inner_type, value)
-        # Handle List[T]
-        elif origin is list and args:
-            inner_type = args[0]
-            init_values[field_name] = [from_dict(inner_type, v) for v in value]
-        # Handle nested dataclass
-        elif is_dataclass(field_type):
-            init_values[field_name] = from_dict(field_type, value)
-        else:
-            # Primitive type, assign directly
-            init_values[field_name] = value
-
-    return cls(**init_values)
+    return _make_builder(cls)(data)
 
 
 
@@ -353,54 +536,124 @@ def is_reload_flag_set(path: Union[str, Path, None] = None) -> bool:
     """
     flag_path = _resolve_path(path)
     try:
-        if not flag_path.exists():
-            return False
-        # Optional: check content instead of mere existence
-        content = flag_path.read_text().strip()
-        return bool(content)
-    except Exception:
+        # One open instead of exists() + read_text(); bytes are enough for a truthiness check
+        with open(flag_path, "rb", buffering=0) as f:
+            return bool(f.read().strip())
+    except Exception:  # missing (FileNotFoundError) or unreadable both count as unset
         return False
 
+_PROJECT_ROOT_MARKERS = frozenset((".git", "pyproject.toml", "setup.py"))
+
+@lru_cache(maxsize=1)
 def get_project_root_os():
-    current_file_path = os.path.abspath(__file__)
-    # Traverse up until a recognizable project root indicator is found
-    # This example looks for a .git directory or a specific project file
+    """
+    Walk up from this file to the first directory holding a .git, pyproject.toml or setup.py.
+    The root cannot move within a process, so the walk runs once and the result is cached.
+    """
+    current_path = os.path.abspath(__file__)
     while True:
-        parent_dir = os.path.dirname(current_file_path)
-        if not parent_dir or parent_dir == current_file_path:
+        parent_dir = os.path.dirname(current_path)
+        if not parent_dir or parent_dir == current_path:
             # Reached the filesystem root or a loop
             return None
-        if os.path.exists(os.path.join(parent_dir, '.git')) or \
-           os.path.exists(os.path.join(parent_dir, 'pyproject.toml')) or \
-           os.path.exists(os.path.join(parent_dir, 'setup.py')):
-            return parent_dir
-        current_file_path = parent_dir
+        # One directory listing per level instead of a stat per marker
+        try:
+            with os.scandir(parent_dir) as entries:
+                if any(entry.name in _PROJECT_ROOT_MARKERS for entry in entries):
+                    return parent_dir
+        except OSError:
+            pass
+        current_path = parent_dir
 
 
 
+# First non-whitespace character of any JSON text (N/I: the NaN/Infinity the stdlib parser accepts)
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
+
 def is_json(value):
     """
     Returns True if `value` is a JSON string (object or array), False otherwise.
+    Bare JSON scalars such as '3', 'true' or '"x"' also parse and return True.
     """
     if not isinstance(value, str):
         return False
+    # Cheap first-character check: most non-JSON strings are rejected without touching the parser
+    if value.lstrip(" \t\n\r")[:1] not in _JSON_START_CHARS:
+        return False
     try:
-        json.loads(value)
+        json_loads(value)
         return True
-    except json.JSONDecodeError:
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
         return False
 
 
-# Lock to ensure thread safety
-_scratch_lock = threading.Lock()
+# Scratch lines are queued by callers and appended by one background writer
+_scratch_queue = queue.SimpleQueue()
+_scratch_writer = None
+_scratch_writer_lock = threading.Lock()
+_SCRATCH_STOP = object()  # queued at exit: the writer finishes everything ahead of it, then returns
+SCRATCH_EXIT_TIMEOUT = 5.0
 
 # Directory to store scratch logs
 SCRATCH_DIR = Path("scratch_logs")
 SCRATCH_DIR.mkdir(exist_ok=True)
 
+def _drain_scratch(first):
+    """Group `first` and everything queued behind it by file; the flag is False once the stop marker was taken."""
+    by_path = {}
+    running = True
+    item = first
+    while True:
+        if item is _SCRATCH_STOP:
+            running = False
+        elif item is not None:
+            file_path, line = item
+            by_path.setdefault(file_path, []).append(line)
+        try:
+            item = _scratch_queue.get_nowait()
+        except queue.Empty:
+            return by_path, running
+
+def _write_scratch_lines(by_path) -> None:
+    """Append each file's lines with one writelines()."""
+    for file_path, lines in by_path.items():
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+def _scratch_writer_loop() -> None:
+    running = True
+    while running:
+        # Block for the first line, then take whatever piled up behind it in the same batch
+        by_path, running = _drain_scratch(_scratch_queue.get())
+        try:
+            _write_scratch_lines(by_path)
+        except Exception as e:
+            # Runs off the caller's thread, so write_scratch() can no longer raise this to its caller
+            print(f"[write_scratch] {e}", file=sys.stderr)
+
+def _stop_scratch_writer() -> None:
+    """atexit: let the writer finish the queued tail (it is a daemon and would be killed mid-batch)."""
+    _scratch_queue.put(_SCRATCH_STOP)
+    _scratch_writer.join(SCRATCH_EXIT_TIMEOUT)
+    if not _scratch_writer.is_alive():
+        # Lines queued after the stop marker (by other exit hooks) are written here
+        _write_scratch_lines(_drain_scratch(None)[0])
+
+def _ensure_scratch_writer() -> None:
+    global _scratch_writer
+    if _scratch_writer is None:
+        with _scratch_writer_lock:
+            if _scratch_writer is None:
+                thread = threading.Thread(target=_scratch_writer_loop, name="scratch-writer", daemon=True)
+                thread.start()
+                _scratch_writer = thread
+                atexit.register(_stop_scratch_writer)
+
 def write_scratch(message: str, filename: str = None):
     """
     Append a message to the daily scratch log in a thread-safe manner.
+    The line is queued and written by a background thread, so callers never wait on file I/O;
+    write errors are reported on stderr instead of being raised here.
     
     :param message: Message to write.
     :param filename: Optional custom filename (defaults to date-based).
@@ -412,14 +665,14 @@ def write_scratch(message: str, filename: str = None):
     # Format the message with timestamp
     line = f"[{now.isoformat()}] {message}\n"
     
-    # Thread-safe write
-    with _scratch_lock:
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(line)
+    _ensure_scratch_writer()
+    _scratch_queue.put((file_path, line))
 
 
 
+@lru_cache(maxsize=1)
 def get_job_count():
+    # Core count cannot change under a running process: computed once
     cores = os.cpu_count() or 1
     # You can tune the scaling here:
     if cores <= 4:
@@ -430,54 +683,130 @@ def get_job_count():
 
 
 # ------------------------- Generic parallel runner -------------------------
+# One worker pool shared by every run_parallel call, created on first use
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_POOL_THREAD_PREFIX = "run_parallel"
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(max_workers=int(max(1, get_job_count())),
+                                           thread_name_prefix=_POOL_THREAD_PREFIX)
+                atexit.register(_POOL.shutdown, wait=False)
+    return _POOL
+
 def run_parallel(fn, items, stop_event=None, collect_errors=True):
-    results, errors = [], []
-    lock = threading.Lock()
     logger = getLogger()
-    
-    max_workers = int(max(1,get_job_count()))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fn, item): item for item in items}
+
+    if threading.current_thread().name.startswith(_POOL_THREAD_PREFIX):
+        # Nested call from a pool worker: waiting on the shared pool could starve it, use a private one
+        with ThreadPoolExecutor(max_workers=int(max(1, get_job_count()))) as executor:
+            return _collect(executor, fn, items, stop_event, collect_errors, logger)
+    return _collect(_get_pool(), fn, items, stop_event, collect_errors, logger)
+
+def _collect(executor, fn, items, stop_event, collect_errors, logger):
+    results, errors = [], []
+    futures = {executor.submit(fn, item): item for item in items}
+    try:
+        # as_completed yields in this thread only, so results/errors need no lock
         for fut in as_completed(futures):
             if stop_event and stop_event.is_set():
                 break
             try:
                 res = fut.result()
                 if res is not None:
-                    with lock:
-                        results.append(res)
+                    results.append(res)
             except Exception as e:
                 logger.logMessage(f"[run_parallel] {e}")
                 if collect_errors:
                     errors.append((futures[fut], e))
                 else:
                     raise
+    finally:
+        # Stopping early or raising: drop work that has not started yet (the pool outlives this call),
+        # then wait for tasks already running so none of them outlives this call either
+        running = [fut for fut in futures if not fut.cancel()]
+        wait(running)
     return results, errors
 
-def is_interactive():
-    """Detects whether this process is running interactively (e.g., not as a daemon)."""
-    try:
-        return sys.stdin.isatty() and sys.stdout.isatty()
-    except Exception:
-        return False
-
-
-
 def wait_interruptible(stop_event, seconds):
-    """Sleep in small chunks so stop_event can interrupt immediately."""
-    end_time = pyTime.time() + seconds
-    while pyTime.time() < end_time and not stop_event.is_set():
-        pyTime.sleep(0.5)
+    """Sleep up to `seconds`, returning as soon as stop_event is set (blocks on the event, no polling)."""
+    if stop_event is None:
+        pyTime.sleep(seconds)
+        return
+    stop_event.wait(seconds)
+
+
+#UPLOAD_URL = "http://<MACBOOK_IP>:8000/ingest"
+UPLOAD_URL = "http://100.80.212.116:8000/api/upload_file"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# One keep-alive session for every upload: consecutive bundles reuse the TCP connection
+_upload_session = None
+_upload_session_lock = threading.Lock()
+
+def _get_upload_session() -> requests.Session:
+    global _upload_session
+    if _upload_session is None:
+        with _upload_session_lock:
+            if _upload_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _upload_session = session
+    return _upload_session
+
+
+class _MultipartFileBody:
+    """
+    Single-file multipart/form-data body streamed from a memory map in UPLOAD_CHUNK_SIZE pieces.
+    __len__ lets requests send a Content-Length instead of materializing the body (files=...
+    builds the whole payload in memory) or falling back to chunked transfer encoding.
+    """
+
+    def __init__(self, field: str, filepath: Path, content_type: str):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._filepath = filepath
+        self._head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filepath.name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._size = os.path.getsize(filepath)
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        yield self._head
+        if self._size:
+            # Hand out read-only slices of a file mapping: the socket copies straight from the
+            # page cache, with no intermediate bytes objects on the Python side
+            with open(self._filepath, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+                    chunk = view[start:start + UPLOAD_CHUNK_SIZE]
+                    try:
+                        yield chunk
+                    finally:
+                        chunk.release()  # the mapping can only close once no slice is exported
+        yield self._tail
 
 
 def try_send(filepath: Path):
     logger = getLogger()
     try:
-        #server_url = "http://<MACBOOK_IP>:8000/ingest"
-        server_url="http://100.80.212.116:8000/api/upload_file"
-        with open(filepath, "rb") as f:
-            files = {"file": (filepath.name, f, "application/json")}
-            resp = requests.post(server_url, files=files, timeout=900)
+        body = _MultipartFileBody("file", filepath, "application/json")
+        resp = _get_upload_session().post(
+            UPLOAD_URL, data=body, headers={"Content-Type": body.content_type}, timeout=900
+        )
         if resp.status_code == 200:
             logger.logMessage(f"Sent {filepath.name} to server.")
             # Optionally delete after successful send
@@ -503,8 +832,8 @@ def send_existing_files():
         and f.name.startswith("option_data_bundle_")
         and f.suffix == ".json"
     ]
-    for file in sorted(bundle_files):
-        try_send(file)
+    # Uploads are I/O-bound: overlap them on the shared pool
+    run_parallel(try_send, sorted(bundle_files))
         
 
 LOW_SPACE_BYTES = 200 * 1024 * 1024  # 200 MB warning threshold